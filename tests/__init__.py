@@ -8,12 +8,78 @@ def test_auto_correct():
 	assert auto_correct("pytho", ["python"]) == "python"
 	assert auto_correct("tree", ("apple", "gold"), "undefined") == "undefined"
 	assert auto_correct("manufacture", ("", " ")) == None
+
+
+def test_Corrector():
+	import difflib
+	words = [a + b + c for a in "bcdfg" for b in "aeiou" for c in "lmnrst"] * 2
+	corrector = Corrector(words)
+	for word in ("bal", "gus", "dor", "fiet", "x", "", "bcdfg"):
+		expected = difflib.get_close_matches(word, words, n=1, cutoff=0.7)
+		assert corrector.correct(word, "none") == (expected[0] if expected else "none")
+		assert auto_correct(word, words) == (expected[0] if expected else None)
+
+
+def test_auto_correct_many():
+	words = ["appel", "mapel", "zzz", "appel"]
+	dictionary = ["apple", "apply", "maple"]
+	expected = [auto_correct(w, dictionary, "?") for w in words]
+	assert auto_correct_many(words, dictionary, "?") == expected
+	assert auto_correct_many(words, dictionary, "?", workers=2, chunksize=1) == expected
+
+
+def test_correct_stream():
+	lines = ["appel and mapel,\n", "zzz appel\n"]
+	dictionary = ["apple", "maple", "and"]
+	expected = ["apple and maple,\n", "zzz apple\n"]
+	assert list(correct_stream(lines, dictionary)) == expected
+	assert list(correct_stream(iter(lines), dictionary, chunk_size=1, workers=2)) == expected
 	
 
 def test_are_close():
 	assert are_close("drama", "trauma", 0.9, 0.7) == None
 	assert are_close("drama", "trauma", 0.9, 0.7, True) == "72%"
 	assert are_close("dream", "lean", 1, 0.1) == None
+	assert are_close("abc", "xyzxyzxyz", 0.9, 0.7) == False
+	assert are_close("kitten", "sitting", 0.9, 0.5, metric="levenshtein") == None
+	assert are_close("martha", "marhta", 0.95, 0.5, True, "jaro_winkler") == "96%"
+
+
+def test_similarity():
+	import difflib
+	assert similarity("kitten", "sitting", "levenshtein") == 1 - 3 / 7
+	assert similarity("", "", "jaro_winkler") == 1.0
+	assert similarity("abc", "xyzxyzxyz", cutoff=0.5) < 0.5
+	assert similarity("hello", "hell", cutoff=0.5) == difflib.SequenceMatcher(None, "hello", "hell").ratio()
+
+
+def test_similarity_join():
+	import difflib
+	left = ["apple", "maple", "apply", "pear", "apple"]
+	right = ["appel", "peer", "grape"]
+	expected = sorted(
+		(i, j, difflib.SequenceMatcher(None, a, b).ratio())
+		for i, a in enumerate(left) for j, b in enumerate(right)
+		if difflib.SequenceMatcher(None, a, b).ratio() >= 0.6
+	)
+	assert similarity_join(left, right, 0.6) == expected
+	assert similarity_join(left, right, 0.6, workers=2, chunksize=1) == expected
+	assert (0, 4, 1.0) in similarity_join(left, threshold=0.9)
+	assert all(i < j for i, j, _ in similarity_join(left, threshold=0.5))
+
+
+def test_are_close_matrix():
+	queries = ["drama", "car", ""]
+	candidates = ["trauma", "cat", "dog", ""]
+	for metric in ("ratio", "levenshtein", "jaro_winkler"):
+		rates = are_close_matrix(queries, candidates, metric)
+		for i, q in enumerate(queries):
+			for j, c in enumerate(candidates):
+				assert rates[i][j] == similarity(q, c, metric)
+	labels = close_labels(are_close_matrix(queries, candidates, cutoff=0.5), 0.9, 0.7)
+	assert labels[0][0] == are_close("drama", "trauma", 0.9, 0.7)
+	assert labels[1][2] == are_close("car", "dog", 0.9, 0.7)
+	assert close_labels(are_close_matrix(queries, candidates), 0.9, 0.7, True)[0][0] == "72%"
 
 
 def test_Index():
@@ -23,10 +89,34 @@ def test_Index():
 
 
 
+def test_IndexedSequence():
+	data = IndexedSequence(["a", "b", ["c"], "b"])
+	assert Index("b", data) == 1
+	assert Index(["c"], data) == 2
+	assert Index("z", data) == None
+	data.append("z")
+	assert Index("z", data) == 4
+	data.insert(0, "b")
+	assert Index("b", data) == 0
+	del data[0]
+	data[1] = "x"
+	assert Index("b", data) == 3
+	data.pop()
+	assert Index("z", data) == None
+	assert data == ["a", "x", ["c"], "b"]
+
+
+
 def test_location():
 	assert location(2, ("a", "b", "c", "d")) == "c"
 	assert get_location(0, "hello") == "h"
 	assert get_location(19, "honor") == None
+	assert location(-1, ["a", "b"]) == "b"
+	assert location(-3, ["a", "b"]) == None
+	assert location(3, iter("abcdef")) == "d"
+	assert location(10, iter("abc")) == None
+	assert location(-2, (c for c in "abcdef")) == "e"
+	assert location(-7, (c for c in "abcdef")) == None
 	
 	
 def test_countFreq():
@@ -34,6 +124,52 @@ def test_countFreq():
 	assert countFreq("independent", "e") == {'e': 3}
 	assert countFreq("", "k") == {'k': 0}
 	assert countFreq("Rhine", "l") == {'l': 0}
+	assert countFreq("aaaa", ["aa", "a"], overlapping=True) == {'aa': 3, 'a': 4}
+	assert countFreq(["ab", "c", "ab"], ("ab", "b")) == {'ab': 2, 'b': 0}
+
+
+def test_countFreq_many_patterns():
+	import itertools
+	text = "abracadabra arcade cab " * 50
+	patterns = ["".join(p) for k in (1, 2, 3, 4) for p in itertools.product("abcdr ", repeat=k)]
+	assert countFreq(text, patterns) == {p: text.count(p) for p in patterns}
+	overlapping = countFreq(text, patterns, overlapping=True)
+	assert all(overlapping[p] == sum(text.startswith(p, i) for i in range(len(text))) for p in patterns)
+
+
+def test_countFreq_sources(tmp_path):
+	import io
+	text = "banana bandana aaa ana " * 20
+	letters = ("a", "an", "ana", "aa", "é")
+	expected = countFreq(text, letters)
+	path = tmp_path / "corpus.txt"
+	path.write_text(text, encoding="utf-8")
+	assert countFreq(path, letters, chunk_size=7) == expected
+	assert countFreq(path, letters, chunk_size=7, workers=2) == expected
+	assert countFreq(io.BytesIO(text.encode()), letters, chunk_size=5) == expected
+	assert countFreq(memoryview(text.encode()), letters, chunk_size=3) == expected
+	assert countFreq(io.StringIO(text), letters, True, chunk_size=4) == countFreq(text, letters, True)
+	for bad in (0, -1):
+		try:
+			countFreq(io.StringIO("abcabc"), ["ab"], chunk_size=bad)
+			assert False
+		except ValueError:
+			pass
+
+
+def test_FrequencyTracker():
+	text = "banana bandana aaa ana"
+	tracker = FrequencyTracker(("a", "an", "aa"))
+	for i in range(0, len(text), 3):
+		tracker.feed(text[i:i + 3])
+	assert tracker.snapshot() == countFreq(text, ("a", "an", "aa"))
+	tracker.evict("banana")
+	assert tracker.snapshot()["a"] == text.count("a") - 3
+
+	window = FrequencyTracker("a", max_chunks=2)
+	for chunk in ("a", "aa", "aaa"):
+		window.feed(chunk)
+	assert window.snapshot() == {'a': 5}
 	
 	
 def test_getabbr():
@@ -52,6 +188,65 @@ def test_variableClass():
 	
 	assert variable.replace("dag", 1, "o") == 'dog'
 
+
+def test_random_ints():
+	values = variable.random_ints(-3, 3, 10000, seed=5)
+	assert len(values) == 10000 and min(values) == -3 and max(values) == 3
+	assert values == variable.random_ints(-3, 3, 10000, seed=5)
+	assert values != variable.random_ints(-3, 3, 10000, seed=5, stream=1)
+	assert variable.random_ints(2, 2, 3, kind="array").tolist() == [2, 2, 2]
+	try:
+		variable.random_ints(3, 2, 1)
+		assert False
+	except ValueError:
+		pass
+
+
+def test_variable_many():
+	rows = ["aktm", "cars", "", "dag"]
+	assert variable.deleteInd_many(rows, [1, -1, 0, 5]) == ['atm', 'car', '', 'dag']
+	assert variable.insert_many("d", ["car", "bar"], 3) == ['card', 'bard']
+	assert variable.replace_many(("burn", "dag"), 1, "o") == ('born', 'dog')
+	assert list(variable.replace_many(iter(rows), -1, ["x", "y", "z", "w"])) == [variable.replace(r, -1, c) for r, c in zip(rows, "xyzw")]
+	assert variable.insert_many("_", rows * 10, -2, workers=2) == [variable.insert("_", r, -2) for r in rows * 10]
+	for bad in (lambda: variable.deleteInd_many(["abc", "def", "ghi"], [0]),
+	            lambda: variable.replace_many(["abc"], 0, ["x", "y"]),
+	            lambda: list(variable.insert_many("x", iter(["abc", "def"]), iter([1])))):
+		try:
+			bad()
+			assert False
+		except ValueError:
+			pass
+
+
+def test_TextPipeline():
+	pipeline = TextPipeline().remove_letters("-").delete("x", -1).deleteInd(0).insert("!", -1).replace(1, "o")
+	text = "-xcax-r"
+	expected = variable.replace(variable.insert("!", variable.deleteInd(variable.delete(strings.remove_letters(text, "-"), "x", -1), 0), -1), 1, "o")
+	assert pipeline(text) == expected
+	assert list(pipeline.apply_many([text, "--"])) == [expected, pipeline.apply("--")]
+	long_text = "ab" * 100000
+	edits = TextPipeline().insert("X", 5).deleteInd(-1).replace(-3, "Y")
+	assert edits(long_text) == variable.replace(variable.deleteInd(variable.insert("X", long_text, 5), -1), -3, "Y")
+
+
+
+def test_MutableText():
+	text = MutableText("car")
+	text.insert("d", 3)
+	text.replace(1, "o")
+	assert str(text) == "cord"
+	text.deleteInd(0)
+	text.insert("l", 0)
+	text.delete("o")
+	assert text == "lrd" and len(text) == 3 and text[1:] == "rd" and text[-1] == "d"
+	text.replace(-1, "!")
+	assert text == variable.replace("lrd", -1, "!")
+
+	document = MutableText("hello world")
+	document.apply_edits([(6, 11, "there"), (0, 1, "H"), (5, 5, ",")])
+	assert str(document) == "Hello, there"
+
 # Class strings
 def test_stringsClass():
 	assert strings.lower_letters[2] == 'c'
@@ -59,3 +254,380 @@ def test_stringsClass():
 	assert strings.digits[-1] == 9
 	
 	assert strings.remove_letters("kwaltlchk", "l", "k") == 'watch'
+	assert strings.remove_letters("a--b-c", "--", "-") == 'abc'
+	assert strings.remove_letters(b"kwaltlchk", "l", b"k") == b'watch'
+	assert list(strings.remove_letters_many(["lead", "lid"], "l", "d")) == ['ea', 'i']
+
+
+def test_cached():
+	import asyncio, time
+	from concurrent.futures import ThreadPoolExecutor
+	calls = []
+
+	@cached(maxsize=2)
+	def slow(x):
+		calls.append(x)
+		time.sleep(0.05)
+		return x * 2
+
+	with ThreadPoolExecutor(8) as pool:
+		assert set(pool.map(slow, [3] * 8)) == {6}
+	assert calls == [3]
+	assert slow([1]) == [1, 1] and slow(3) == 6
+	slow(4)
+	assert slow.cache_info().evictions == 1 and slow.cache_info().currsize == 2
+	slow.cache_clear()
+	assert slow.cache_info().currsize == 0
+
+	@cached
+	def show(x):
+		return repr(x)
+
+	# a frozen unhashable argument never shares an entry with a plain tuple
+	assert show([1, 2]) == "[1, 2]" and show(("tuple", ("list", 1, 2))) == "('tuple', ('list', 1, 2))"
+	assert show({"a": [1]}) == show({"a": [1]}) and show.cache_info().hits == 1
+
+	@cached(ttl=0.01)
+	async def double(x):
+		calls.append(x)
+		await asyncio.sleep(0.01)
+		return x * 2
+
+	async def main():
+		return await asyncio.gather(*[double(5) for _ in range(5)])
+
+	assert asyncio.run(main()) == [10] * 5
+	assert calls.count(5) == 1
+
+
+def test_disk_cached(tmp_path):
+	path = tmp_path / "cache.sqlite"
+	calls = []
+
+	@disk_cached(path, max_bytes=2000)
+	def square(x):
+		calls.append(x)
+		return str(x * x) * 200
+
+	assert square(3) == square(3) == "9" * 200 and calls == [3]
+	for i in range(20):
+		square(i)
+	info = square.cache_info()
+	assert info.evictions > 0 and info.currsize <= 2000
+
+	@disk_cached(path)
+	def square(x):
+		return x * x
+
+	# a new source invalidates the old results
+	assert square(3) == 9
+
+	@disk_cached(path)
+	def value(box):
+		return box()
+
+	# unpicklable arguments (lambdas here) bypass the cache instead of sharing a key
+	assert value(lambda: 1) == 1 and value(lambda: 2) == 2
+
+	@disk_cached(path)
+	def ordered(words):
+		return sorted(words)
+
+	assert ordered(frozenset("abc")) == ordered(frozenset("cba")) == ["a", "b", "c"]
+	assert ordered.cache_info().hits == 1
+
+
+def test_timer():
+	durations = []
+
+	@timer(sink=lambda name, ns: durations.append((name, ns)))
+	def add(a, b):
+		return a + b
+
+	assert add(2, 3) == 5 and add(1, 1) == 2
+	assert [name for name, _ in durations] == ["test_timer.<locals>.add"] * 2
+	stats = add.stats()
+	assert stats["count"] == 2 and 0 < stats["p50"] <= stats["max"]
+
+	@timer(sink=None, sample_rate=0.0)
+	def untimed():
+		return "result"
+
+	assert untimed() == "result" and untimed.stats()["count"] == 0
+
+
+def test_profiled(tmp_path):
+	@profiled(memory=True)
+	def build(n):
+		return [str(i) for i in range(n)]
+
+	assert len(build(10)) == 10
+	assert "0 profiled call(s)" in build.report()
+	set_profiling(True)
+	try:
+		assert len(build(1000)) == 1000
+	finally:
+		set_profiling(False)
+	report = build.report(top=5)
+	assert "1 profiled call(s)" in report and "allocations" in report
+	build.dump_stats(tmp_path / "build.prof")
+	assert (tmp_path / "build.prof").stat().st_size > 0
+
+	import asyncio
+
+	@profiled
+	async def abuild(n):
+		await asyncio.sleep(0)
+		return [str(i) for i in range(n)]
+
+	set_profiling(True)
+	try:
+		assert len(asyncio.run(abuild(100))) == 100
+	finally:
+		set_profiling(False)
+	assert "1 profiled call(s)" in abuild.report() and "(sleep)" in abuild.report()
+
+
+def test_async_decorators():
+	import asyncio, time
+
+	@delayed(0.05)
+	async def echo(value):
+		return value
+
+	@timer(sink=None)
+	async def timed():
+		await asyncio.sleep(0.01)
+		return "timed"
+
+	@encrypted
+	async def secret():
+		return "Hello world"
+
+	async def main():
+		start = time.perf_counter()
+		values = await asyncio.gather(*[echo(i) for i in range(10)])
+		# the sleeps overlap instead of blocking the loop one after another
+		assert values == list(range(10)) and time.perf_counter() - start < 0.4
+		assert await timed() == "timed" and timed.stats()["count"] == 1
+		assert await secret() == "SGVsbG8gd29ybGQ="
+
+	asyncio.run(main())
+
+
+def test_delayed():
+	@delayed(0.01)
+	def double(x):
+		return x * 2
+
+	assert double(2) == 4
+
+	@delayed(0.05, scheduled=True)
+	def triple(x):
+		return x * 3
+
+	futures = [triple(i) for i in range(20)]
+	assert [future.result(timeout=5) for future in futures] == [i * 3 for i in range(20)]
+
+
+def test_run_once():
+	import time
+	from concurrent.futures import ThreadPoolExecutor
+	loads = []
+
+	@run_once(mode="return")
+	def load():
+		loads.append(1)
+		time.sleep(0.05)
+		return object()
+
+	with ThreadPoolExecutor(8) as pool:
+		results = list(pool.map(lambda _: load(), range(8)))
+	assert len(loads) == 1 and all(result is results[0] for result in results)
+	assert load.__name__ == "load"
+
+	@run_once
+	def temp():
+		return "Hello world"
+
+	assert temp() == "Hello world"
+	try:
+		temp()
+		assert False
+	except Exception as error:
+		assert str(error) == "Function 'temp' can only run once."
+	temp.reset()
+	assert temp() == "Hello world"
+
+
+def test_encrypted():
+	@encrypted
+	def example():
+		return "Hello world"
+
+	assert example() == "SGVsbG8gd29ybGQ="
+	assert encrypted(lambda: memoryview(b"Hello world"))() == "SGVsbG8gd29ybGQ="
+	assert encrypted(lambda: None)() is None
+
+	data = bytes(range(256)) * 40
+
+	def stream():
+		for i in range(0, len(data), 77):
+			yield data[i:i + 77]
+
+	chunks = list(encrypted(chunk_size=100)(stream)())
+	assert len(chunks) > 1 and "".join(chunks) == encrypted(lambda: data)()
+	# one large item is still encoded chunk_size bytes at a time
+	chunks = list(encrypted(chunk_size=99)(lambda: iter([data]))())
+	assert max(map(len, chunks)) == 132 and "".join(chunks) == encrypted(lambda: data)()
+	pieces = list(decrypted(chunk_size=100)(lambda: iter(["".join(chunks)]))())
+	assert max(map(len, pieces)) <= 75 and b"".join(pieces) == data
+
+	for codec in ("base64", "urlsafe", "base85"):
+		encoded = encrypted(codec=codec, compress=True)(lambda: data)()
+		assert decrypted(codec=codec, compress=True)(lambda: encoded)() == data
+		pieces = list(encrypted(codec=codec, compress=True, chunk_size=64)(stream)())
+		assert b"".join(decrypted(codec=codec, compress=True, chunk_size=50)(lambda: iter(pieces))()) == data
+	assert decrypted(encoding="utf-8")(example)() == "Hello world"
+	for result in ({"a": 1}, [1, 2], 3):
+		try:
+			encrypted(lambda: result)()
+			assert False
+		except TypeError:
+			pass
+
+
+def test_rate_limited():
+	import asyncio, time
+
+	@rate_limited(50, 1.0, burst=2)
+	def call(i):
+		return i
+
+	start = time.perf_counter()
+	assert [call(i) for i in range(7)] == list(range(7))
+	assert time.perf_counter() - start >= 0.09
+	assert call.limiter_stats()["calls"] == 7 and call.limiter_stats()["waited"] > 0
+
+	@rate_limited(1, 60, block=False)
+	def once():
+		return "ok"
+
+	assert once() == "ok"
+	try:
+		once()
+		assert False
+	except RateLimited:
+		assert once.limiter_stats()["rejected"] == 1
+
+	@throttle(60)
+	def refresh(i):
+		return i
+
+	assert [refresh(i) for i in range(3)] == [0, 0, 0]
+
+	@debounce(0.02)
+	def save(text):
+		return text.upper()
+
+	futures = [save(text) for text in ("a", "ab", "abc")]
+	assert [future.result(timeout=5) for future in futures] == ["ABC"] * 3
+
+	@debounce(0.02)
+	async def asave(text):
+		return text.upper()
+
+	async def main():
+		return await asyncio.gather(asave("x"), asave("xy"))
+
+	assert asyncio.run(main()) == ["XY", "XY"]
+
+	@debounce(0.01)
+	async def slow_save(text):
+		await asyncio.sleep(0.05)
+		return text.upper()
+
+	async def mid_run():
+		first = asyncio.ensure_future(slow_save("a"))
+		await asyncio.sleep(0.03)  # "a" is running now
+		return await first, await slow_save("b")
+
+	assert asyncio.run(mid_run()) == ("A", "B")
+
+
+def test_retry():
+	import asyncio
+	failures = []
+
+	@retry(4, delay=0.001, on=ValueError)
+	def flaky():
+		if len(failures) < 2:
+			failures.append(1)
+			raise ValueError("flaky")
+		return "done"
+
+	assert flaky() == "done"
+	assert flaky.retry_stats() == {"calls": 1, "attempts": 3, "retries": 2, "failures": 0}
+
+	@retry(3, backoff="constant", delay=0.001)
+	async def broken():
+		raise OSError("down")
+
+	try:
+		asyncio.run(broken())
+		assert False
+	except OSError:
+		assert broken.retry_stats()["attempts"] == 3 and broken.retry_stats()["failures"] == 1
+
+	@retry(3, on=ValueError)
+	def wrong():
+		raise KeyError("not retried")
+
+	try:
+		wrong()
+	except KeyError:
+		assert wrong.retry_stats()["attempts"] == 1
+
+
+def test_timeout():
+	import asyncio, time
+
+	@timeout(0.05)
+	def wait(seconds):
+		time.sleep(seconds)
+		return seconds
+
+	assert wait(0) == 0
+	try:
+		wait(0.5)
+		assert False
+	except TimeoutError:
+		assert wait.timeout_stats() == {"calls": 2, "timeouts": 1}
+
+	@timeout(0.05)
+	async def await_(seconds):
+		await asyncio.sleep(seconds)
+		return seconds
+
+	assert asyncio.run(await_(0)) == 0
+
+	@timeout(5)
+	def refused():
+		raise TimeoutError("from the function")
+
+	@timeout(5)
+	async def arefused():
+		raise TimeoutError("from the coroutine")
+
+	for call in (refused, lambda: asyncio.run(arefused())):
+		try:
+			call()
+			assert False
+		except TimeoutError as error:
+			assert str(error).startswith("from the")
+	assert refused.timeout_stats()["timeouts"] == arefused.timeout_stats()["timeouts"] == 0
+	try:
+		asyncio.run(await_(0.5))
+		assert False
+	except TimeoutError:
+		assert await_.timeout_stats()["timeouts"] == 1
@@ -1,4 +1,6 @@
-from typing import Any, Optional 
+import re
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, Optional 
 
 
 
@@ -18,14 +20,95 @@ class strings:
     def remove_letters(text: str, *letters: str) -> str:
         """
         Remove specific letters from a string.
+
+        Single letters are deleted with a cached str.translate table (or a
+        few str.replace calls on short text). Longer tokens are removed in
+        one left-to-right regex pass, longest first. bytes text is filtered
+        with bytes.translate.
         
         arguments:
-        text -- the text to filter
-        *letters -- unlimited amount of letters to delete
+        text -- the text to filter (str or bytes)
+        *letters -- unlimited amount of letters (or longer tokens) to delete
 
         >>> strings.remove_letters("wlatlchi", "i", "l") → 'watch'
+        >>> strings.remove_letters("a--b--c", "--") → 'abc'
+        """
+        try:
+            if isinstance(text, str):
+                return _remove_text(text, _text_plan(letters))
+            if isinstance(text, (bytes, bytearray)):
+                return _remove_bytes(text, _bytes_plan(letters))
+        except TypeError:
+            # unhashable tokens can't be cached, and could never be removed anyway
+            return strings.remove_letters(text, *_hashable(letters))
+        return ''.join([l for l in text if l not in letters])
+
+    @staticmethod
+    def remove_letters_many(texts: Iterable[Any], *letters: str) -> Iterator[Any]:
+        """
+        Lazily remove the same letters from every string of an iterable or file.
+
+        arguments:
+        texts -- iterable of strings (or bytes), such as a list or an open file
+        *letters -- unlimited amount of letters (or longer tokens) to delete
+
+        >>> list(strings.remove_letters_many(["a-b", "c-d"], "-")) → ['ab', 'cd']
         """
-        filtered = [l for l in text if l not in letters]
-        return ''.join(filtered)
+        letters = _hashable(letters)
+        for text in texts:
+            if isinstance(text, str):
+                yield _remove_text(text, _text_plan(letters))
+            else:
+                yield _remove_bytes(text, _bytes_plan(letters))
+
+
+# below this len(text) * len(letters), chained str.replace beats str.translate
+_REPLACE_LIMIT = 2048
+
+
+def _hashable(letters: tuple[Any, ...]) -> tuple[Any, ...]:
+    """Drop the tokens that could never be removed, so the tuple can be cached."""
+    return tuple(bytes(l) if isinstance(l, bytearray) else l
+                 for l in letters if isinstance(l, (str, bytes, bytearray)))
+
+
+@lru_cache(maxsize=256)
+def _text_plan(letters: tuple[Any, ...]) -> tuple[str, dict, Optional[re.Pattern]]:
+    tokens = [l for l in letters if isinstance(l, str) and l]
+    chars = "".join(dict.fromkeys(l for l in tokens if len(l) == 1))
+    pattern = _token_pattern(tokens) if any(len(l) > 1 for l in tokens) else None
+    return chars, str.maketrans("", "", chars), pattern
+
+
+@lru_cache(maxsize=256)
+def _bytes_plan(letters: tuple[Any, ...]) -> tuple[bytes, Optional[re.Pattern]]:
+    tokens = [l.encode() if isinstance(l, str) else bytes(l) for l in letters
+              if isinstance(l, (str, bytes, bytearray))]
+    tokens = [l for l in tokens if l]
+    pattern = _token_pattern(tokens) if any(len(l) > 1 for l in tokens) else None
+    return b"".join(l for l in tokens if len(l) == 1), pattern
+
+
+def _remove_text(text: str, plan: tuple[str, dict, Optional[re.Pattern]]) -> str:
+    chars, table, pattern = plan
+    if pattern is not None:
+        return pattern.sub("", text)
+    if len(text) * len(chars) <= _REPLACE_LIMIT:
+        for ch in chars:
+            text = text.replace(ch, "")
+        return text
+    return text.translate(table)
+
+
+def _remove_bytes(text: Any, plan: tuple[bytes, Optional[re.Pattern]]) -> bytes:
+    delete, pattern = plan
+    if pattern is not None:
+        return pattern.sub(b"", text)
+    return text.translate(None, delete)
 
 
+def _token_pattern(tokens: list[Any]) -> re.Pattern:
+    """Compile an alternation matching the longest token first."""
+    tokens = sorted(set(tokens), key=len, reverse=True)
+    separator = b"|" if isinstance(tokens[0], bytes) else "|"
+    return re.compile(separator.join(map(re.escape, tokens)))
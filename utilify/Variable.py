@@ -1,5 +1,13 @@
-import random, sys, os
-from typing import Any, Optional 
+import random, sys, os, numbers, itertools, array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable, Iterator, Optional 
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, random_ints falls back to the random module
+    np = None
+
+from .Strings import _hashable, _remove_text, _text_plan
 
 
 
@@ -63,8 +71,542 @@ class variable:
         """
         return var[:var_ind] + replacement + var[var_ind + 1:]
 
+    @staticmethod
+    def deleteInd_many(column: Any, var_ind: Any = -1, workers: Optional[int] = None) -> Any:
+        """
+        variable.deleteInd for every string of a column.
+
+        arguments:
+        column -- list, tuple, NumPy/Arrow string array or iterator of strings
+        var_ind -- one index for every row, or a sequence with one index per row
+        workers -- number of worker processes for list-like columns
+
+        returns a column of the same kind (an iterator gives a lazy iterator).
+
+        >>> variable.deleteInd_many(["aktm", "cars"], [1, -1]) → ['atm', 'car']
+        """
+        return _edit_column("deleteInd", column, var_ind, "", workers)
+
+    @staticmethod
+    def insert_many(char: Any, column: Any, var_ind: Any = -1, workers: Optional[int] = None) -> Any:
+        """
+        variable.insert for every string of a column.
+
+        arguments:
+        char -- one character for every row, or a sequence with one per row
+        column -- list, tuple, NumPy/Arrow string array or iterator of strings
+        var_ind -- one index for every row, or a sequence with one index per row
+        workers -- number of worker processes for list-like columns
+
+        >>> variable.insert_many("d", ["car", "bar"], 3) → ['card', 'bard']
+        """
+        return _edit_column("insert", column, var_ind, char, workers)
+
+    @staticmethod
+    def replace_many(column: Any, var_ind: Any, replacement: Any, workers: Optional[int] = None) -> Any:
+        """
+        variable.replace for every string of a column.
+
+        arguments:
+        column -- list, tuple, NumPy/Arrow string array or iterator of strings
+        var_ind -- one index for every row, or a sequence with one index per row
+        replacement -- one replacement for every row, or a sequence with one per row
+        workers -- number of worker processes for list-like columns
+
+        >>> variable.replace_many(["burn", "dag"], 1, "o") → ['born', 'dog']
+        """
+        return _edit_column("replace", column, var_ind, replacement, workers)
+
     @staticmethod
     def random_int(minimum: int, maximum: int) -> int:
         """Generates a random integer between two values"""
         return random.randint(minimum, maximum)
 
+    @staticmethod
+    def random_ints(minimum: int, maximum: int, n: int, kind: str = "list",
+                    seed: Optional[int] = None, stream: Optional[int] = None) -> Any:
+        """
+        Generates n random integers between two values, both included.
+
+        arguments:
+        minimum, maximum -- bounds of the values, like random.randint
+        n -- number of values
+        kind -- "list", "array" (array.array of signed 64 bit ints) or "numpy"
+        seed -- seed for reproducible values
+        stream -- index of an independent stream of the same seed, e.g. one per thread or process
+
+        >>> variable.random_ints(1, 6, 5, seed=7) → [6, 4, 5, 6, 4]  (with numpy installed)
+        """
+        if minimum > maximum:
+            raise ValueError(f"empty range for random_ints ({minimum}, {maximum})")
+        if kind not in ("list", "array", "numpy"):
+            raise ValueError(f"unknown kind {kind!r}, use 'list', 'array' or 'numpy'")
+        if np is not None and _INT64_MIN <= minimum and maximum <= _INT64_MAX:
+            values = _generator(seed, stream).integers(minimum, maximum, size=n, dtype=np.int64, endpoint=True)
+            if kind == "numpy":
+                return values
+            if kind == "array":
+                ints = array.array("q")
+                ints.frombytes(values.tobytes())
+                return ints
+            return values.tolist()
+        if kind == "numpy":
+            raise ImportError("random_ints(kind='numpy') requires numpy")
+
+        if seed is None and stream is not None:
+            # streams of an unseeded call still need fresh entropy, like SeedSequence(None)
+            seed = random.SystemRandom().getrandbits(64)
+        rand = random.Random(seed if stream is None else f"{seed}:{stream}")
+        if maximum - minimum < 1 << 32:
+            values = rand.choices(range(minimum, maximum + 1), k=n)
+        else:
+            values = [rand.randint(minimum, maximum) for _ in range(n)]
+        return array.array("q", values) if kind == "array" else values
+
+
+
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+
+def _generator(seed: Optional[int], stream: Optional[int]) -> Any:
+    """A NumPy Generator, one independent child stream of the seed per stream index."""
+    if stream is None:
+        return np.random.default_rng(seed)
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(stream,)))
+
+
+def _edit_column(kind: str, column: Any, var_ind: Any, value: Any, workers: Optional[int]) -> Any:
+    """Apply one `variable` edit to every row and return a column of the same kind."""
+    inds = _per_row(var_ind)
+    values = _per_row(value)
+    module = type(column).__module__.split(".")[0]
+    if module in ("numpy", "pyarrow"):
+        rows = column.tolist() if module == "numpy" else column.to_pylist()
+    elif isinstance(column, (list, tuple)):
+        rows = column
+    else:
+        # a lazy column stays lazy
+        return _edit_lazy(kind, column, inds, values)
+
+    inds, values = _listed(inds), _listed(values)
+    for name, given in (("var_ind", inds), ("value", values)):
+        if isinstance(given, list) and len(given) != len(rows):
+            raise ValueError(f"{name} has {len(given)} entries for {len(rows)} rows")
+
+    if not workers or workers <= 1 or len(rows) < 2:
+        edited = _edit_rows(kind, rows, inds, values)
+    else:
+        size = -(-len(rows) // (workers * 4))
+        parts = [(kind, rows[i:i + size], _cut(inds, i, size), _cut(values, i, size))
+                 for i in range(0, len(rows), size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            edited = [row for part in pool.map(_edit_part, parts) for row in part]
+
+    if module == "pyarrow":
+        import pyarrow
+        return pyarrow.array(edited, type=column.type)
+    if module == "numpy":
+        import numpy
+        return numpy.array(edited, dtype=object if column.dtype == object else None)
+    return tuple(edited) if isinstance(column, tuple) else edited
+
+
+_EDITS = {
+    "deleteInd": lambda row, i, _: variable.deleteInd(row, i),
+    "insert": lambda row, i, char: variable.insert(char, row, i),
+    "replace": lambda row, i, replacement: variable.replace(row, i, replacement),
+}
+
+
+def _per_row(value: Any) -> Any:
+    """Keep a broadcast index or string as it is, turn per-row values into a list."""
+    if isinstance(value, (str, numbers.Integral)):
+        return value
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "to_pylist"):
+        return value.to_pylist()
+    return value if not hasattr(value, "__len__") else list(value)
+
+
+def _repeat(value: Any) -> Iterator[Any]:
+    return itertools.repeat(value) if isinstance(value, (str, numbers.Integral)) else iter(value)
+
+
+def _edit_lazy(kind: str, column: Any, inds: Any, values: Any) -> Iterator[str]:
+    edit, inds, values = _EDITS[kind], _repeat(inds), _repeat(values)
+    missing = object()
+    for row in column:
+        i, v = next(inds, missing), next(values, missing)
+        if i is missing or v is missing:
+            raise ValueError("fewer per-row indices or values than rows")
+        yield edit(row, i, v)
+    for rest in (inds, values):
+        if not isinstance(rest, itertools.repeat) and next(rest, missing) is not missing:
+            raise ValueError("more per-row indices or values than rows")
+
+
+def _listed(value: Any) -> Any:
+    return value if isinstance(value, (str, numbers.Integral, list)) else list(value)
+
+
+def _cut(value: Any, start: int, size: int) -> Any:
+    return value[start:start + size] if isinstance(value, list) else value
+
+
+def _edit_part(part: tuple) -> list[str]:
+    return _edit_rows(*part)
+
+
+def _edit_rows(kind: str, rows: Any, inds: Any, values: Any) -> list[str]:
+    if isinstance(inds, numbers.Integral) and isinstance(values, str):
+        # broadcast edits inline the scalar formulas in one comprehension
+        i, v = inds, values
+        if kind == "insert":
+            return [r[:i] + v + r[i:] for r in rows]
+        if kind == "replace":
+            return [r[:i] + v + r[i + 1:] for r in rows]
+        if i >= 0:
+            return [r[:i] + r[i + 1:] for r in rows]
+    edit = _EDITS[kind]
+    return [edit(r, i, v) for r, i, v in zip(rows, _repeat(inds), _repeat(values))]
+
+
+class TextPipeline:
+    """
+    Record a chain of text edits once, then run them in as few passes as possible.
+
+    Consecutive single-letter removals share one translate table, and
+    consecutive index edits (deleteInd, insert, replace) are planned on
+    slices and joined once. Every step gives the same result as the
+    matching `strings`/`variable` function.
+
+    >>> clean = TextPipeline().remove_letters("-", "_").insert("!", -1).replace(0, "C")
+    >>> clean("c-a_r") → 'Ca!r'
+    """
+
+    def __init__(self) -> None:
+        self._steps: list[tuple] = []
+        self._stages: Optional[list[tuple]] = None
+
+    def _add(self, *step: Any) -> "TextPipeline":
+        self._steps.append(step)
+        self._stages = None
+        return self
+
+    def remove_letters(self, *letters: str) -> "TextPipeline":
+        """Same as strings.remove_letters(text, *letters)."""
+        return self._add("remove", _hashable(letters))
+
+    def delete(self, letter: str, occurrences: int = 1) -> "TextPipeline":
+        """Same as variable.delete(text, letter, occurrences)."""
+        if len(letter) == 1 and occurrences < 0:
+            return self._add("remove", (letter,))
+        return self._add("delete", letter, occurrences)
+
+    def deleteInd(self, var_ind: int = -1) -> "TextPipeline":
+        """Same as variable.deleteInd(text, var_ind)."""
+        return self._add("edit", "deleteInd", var_ind, "")
+
+    def insert(self, char: str, var_ind: int = -1) -> "TextPipeline":
+        """Same as variable.insert(char, text, var_ind)."""
+        return self._add("edit", "insert", var_ind, char)
+
+    def replace(self, var_ind: int, replacement: str) -> "TextPipeline":
+        """Same as variable.replace(text, var_ind, replacement)."""
+        return self._add("edit", "replace", var_ind, replacement)
+
+    def compile(self) -> "TextPipeline":
+        """Fuse the recorded steps into stages; called automatically when needed."""
+        stages: list[tuple] = []
+        for kind, *args in self._steps:
+            last = stages[-1] if stages else None
+            if kind == "remove":
+                letters = args[0]
+                # deleting single letters commutes, so neighbouring sets merge
+                if last and last[0] == "remove" and all(len(l) <= 1 for l in last[1] + letters):
+                    letters = last[1] + letters
+                    stages.pop()
+                stages.append(("remove", letters, _text_plan(letters)))
+            elif kind == "edit":
+                if last and last[0] == "edit":
+                    last[1].append(tuple(args))
+                else:
+                    stages.append(("edit", [tuple(args)]))
+            else:
+                stages.append(tuple([kind, *args]))
+        self._stages = stages
+        return self
+
+    def apply(self, text: str) -> str:
+        """Run the pipeline on one string."""
+        if self._stages is None:
+            self.compile()
+        for stage in self._stages:
+            if stage[0] == "remove":
+                text = _remove_text(text, stage[2])
+            elif stage[0] == "delete":
+                text = text.replace(stage[1], "", stage[2])
+            else:
+                text = _apply_edits(text, stage[1])
+        return text
+
+    __call__ = apply
+
+    def apply_many(self, texts: Iterable[str]) -> Iterator[str]:
+        """Lazily run the pipeline on every string of a list, iterator or open file."""
+        if self._stages is None:
+            self.compile()
+        for text in texts:
+            yield self.apply(text)
+
+
+# below this length, copying the text for each edit is cheaper than planning slices
+_PLAN_MIN_LENGTH = 1 << 17
+
+
+def _apply_edits(text: str, edits: list[tuple[str, int, str]]) -> str:
+    """
+    Run index edits on a list of slices of `text`, then join it once.
+
+    Every edit has the form text[:a] + added + text[b:], with Python's
+    slicing rules, which is exactly how the `variable` functions work.
+    """
+    if len(text) < _PLAN_MIN_LENGTH:
+        for kind, i, added in edits:
+            if kind == "deleteInd" and i < 0:
+                i += len(text)
+            text = text[:i] + added + text[i + (kind != "insert"):]
+        return text
+
+    pieces: list[Any] = [(0, len(text))]
+    length = len(text)
+    for kind, i, added in edits:
+        if kind == "deleteInd" and i < 0:
+            i += length
+        a, b = i, i + (kind != "insert")
+        a = slice(None, a).indices(length)[1]
+        b = slice(b, None).indices(length)[0]
+        pieces = _take(pieces, 0, a) + ([added] if added else []) + _take(pieces, b, length)
+        length = a + len(added) + max(0, length - b)
+    return "".join([text[p[0]:p[1]] if isinstance(p, tuple) else p for p in pieces])
+
+
+def _take(pieces: list[Any], start: int, stop: int) -> list[Any]:
+    """The pieces covering positions start..stop of the text they describe."""
+    taken = []
+    position = 0
+    for piece in pieces:
+        size = piece[1] - piece[0] if isinstance(piece, tuple) else len(piece)
+        lo, hi = max(start, position), min(stop, position + size)
+        if lo < hi:
+            if isinstance(piece, tuple):
+                taken.append((piece[0] + lo - position, piece[0] + hi - position))
+            else:
+                taken.append(piece[lo - position:hi - position])
+        position += size
+        if position >= stop:
+            break
+    return taken
+
+
+class MutableText:
+    """
+    A mutable string for many edits on a large text.
+
+    The text is kept in a rope (a randomized balanced tree of string
+    pieces) that is never modified in place, so every index edit only
+    rebuilds O(log n) nodes instead of copying the whole text. `str()`
+    joins the pieces once and is cached until the next edit.
+
+    The methods mirror the `variable` toolkit, with the same index rules.
+
+    >>> text = MutableText("car")
+    >>> text.insert("d", 3)
+    >>> text.replace(1, "o")
+    >>> str(text) → 'cord'
+    """
+
+    def __init__(self, text: str = "") -> None:
+        self._root = _build([text[i:i + _PIECE_SIZE] for i in range(0, len(text), _PIECE_SIZE)])
+        self._text: Optional[str] = text
+
+    def __len__(self) -> int:
+        return _size(self._root)
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = "".join(_pieces(self._root))
+        return self._text
+
+    def __repr__(self) -> str:
+        return f"MutableText({str(self)!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (MutableText, str)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __getitem__(self, index: Any) -> str:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return str(self)[index]
+            middle = _split(_split(self._root, max(start, stop))[0], start)[1]
+            return "".join(_pieces(middle))
+        index = range(len(self))[index]
+        node = self._root
+        while True:
+            left = _size(node.left)
+            if index < left:
+                node = node.left
+            elif index < left + len(node.text):
+                return node.text[index - left]
+            else:
+                index -= left + len(node.text)
+                node = node.right
+
+    def _edit(self, a: int, b: int, added: str) -> None:
+        """Become text[:a] + added + text[b:], with Python's slicing rules."""
+        length = len(self)
+        a = slice(None, a).indices(length)[1]
+        b = slice(b, None).indices(length)[0]
+        if b >= a:
+            head, rest = _split(self._root, a)
+            tail = _split(rest, b - a)[1]
+        else:
+            # text[b:] starts before text[:a] ends, both come from the old rope
+            head = _split(self._root, a)[0]
+            tail = _split(self._root, b)[1]
+        self._root = _merge(_merge(head, _node(added)), tail)
+        self._text = None
+
+    def deleteInd(self, var_ind: int = -1) -> None:
+        """Delete a specific letter by index, like variable.deleteInd."""
+        if var_ind < 0:
+            var_ind += len(self)
+        self._edit(var_ind, var_ind + 1, "")
+
+    def delete(self, letter: str, occurrences: int = 1) -> None:
+        """Delete a letter by given occurrences, like variable.delete (O(n): it has to search)."""
+        self.__init__(str(self).replace(letter, "", occurrences))
+
+    def insert(self, char: str, var_ind: int = -1) -> None:
+        """Add a specific letter at a specific index, like variable.insert."""
+        self._edit(var_ind, var_ind, char)
+
+    def replace(self, var_ind: int, replacement: str) -> None:
+        """Replace a letter by index, like variable.replace."""
+        self._edit(var_ind, var_ind + 1, replacement)
+
+    def apply_edits(self, edits: Iterable[tuple[int, int, str]]) -> None:
+        """
+        Apply many edits at once, all positioned on the text before the batch.
+
+        Each edit is (start, stop, replacement) and replaces text[start:stop];
+        use start == stop to insert and an empty replacement to delete. Edits
+        may not overlap; insertions at the same position keep their order.
+
+        >>> text = MutableText("hello world")
+        >>> text.apply_edits([(0, 1, "H"), (5, 5, ","), (6, 11, "there")])
+        >>> str(text) → 'Hello, there'
+        """
+        length = len(self)
+        spans = []
+        for start, stop, replacement in edits:
+            start, stop, _ = slice(start, stop).indices(length)
+            spans.append((start, max(start, stop), replacement))
+        spans.sort(key=lambda span: span[0])
+
+        root = None
+        position = 0
+        for start, stop, replacement in spans:
+            if start < position:
+                raise ValueError(f"Edit at {start} overlaps the edit ending at {position}")
+            kept = _split(_split(self._root, start)[0], position)[1]
+            root = _merge(_merge(root, kept), _node(replacement))
+            position = stop
+        self._root = _merge(root, _split(self._root, position)[1])
+        self._text = None
+
+
+# initial texts are cut into pieces of this many characters
+_PIECE_SIZE = 1024
+
+
+class _Node:
+    __slots__ = ("text", "left", "right", "priority", "size")
+
+    def __init__(self, text: str, left: Optional["_Node"], right: Optional["_Node"], priority: float) -> None:
+        self.text = text
+        self.left = left
+        self.right = right
+        self.priority = priority
+        self.size = (left.size if left is not None else 0) + len(text) + (right.size if right is not None else 0)
+
+
+def _size(node: Optional[_Node]) -> int:
+    return node.size if node is not None else 0
+
+
+def _node(text: str) -> Optional[_Node]:
+    return _Node(text, None, None, random.random()) if text else None
+
+
+def _build(pieces: list[str]) -> Optional[_Node]:
+    """Build a treap over the pieces in O(n) (Cartesian tree on random priorities)."""
+    stack: list[list] = []
+    for text in pieces:
+        item = [text, None, None, random.random()]
+        last = None
+        while stack and stack[-1][3] < item[3]:
+            last = stack.pop()
+        item[1] = last
+        if stack:
+            stack[-1][2] = item
+        stack.append(item)
+
+    def freeze(item: Optional[list]) -> Optional[_Node]:
+        if item is None:
+            return None
+        return _Node(item[0], freeze(item[1]), freeze(item[2]), item[3])
+
+    return freeze(stack[0]) if stack else None
+
+
+def _merge(a: Optional[_Node], b: Optional[_Node]) -> Optional[_Node]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.priority > b.priority:
+        return _Node(a.text, a.left, _merge(a.right, b), a.priority)
+    return _Node(b.text, _merge(a, b.left), b.right, b.priority)
+
+
+def _split(node: Optional[_Node], k: int) -> tuple[Optional[_Node], Optional[_Node]]:
+    """Split into the first k characters and the rest, sharing untouched nodes."""
+    if node is None:
+        return None, None
+    left = _size(node.left)
+    if k <= left:
+        a, b = _split(node.left, k)
+        return a, _Node(node.text, b, node.right, node.priority)
+    if k >= left + len(node.text):
+        a, b = _split(node.right, k - left - len(node.text))
+        return _Node(node.text, node.left, a, node.priority), b
+    cut = k - left
+    return (_Node(node.text[:cut], node.left, None, node.priority),
+            _Node(node.text[cut:], None, node.right, node.priority))
+
+
+def _pieces(node: Optional[_Node]) -> Iterator[str]:
+    """The pieces of a rope in order, without recursion."""
+    stack = []
+    while stack or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        yield node.text
+        node = node.right
@@ -1,12 +1,238 @@
-import difflib, time, sys, random, os, threading, base64
+import difflib, time, sys, random, os, threading, base64, math, re, itertools, collections, io, mmap
 import contextlib
-from typing import Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+from collections.abc import MutableSequence
+from typing import Any, Iterator, Optional
 import string
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, the matrix helpers fall back to lists
+    np = None
+
+
+class Corrector:
+    """
+    A reusable auto-corrector built once from a dictionary.
+
+    Every word is split into (character, occurrence) tokens. For each word
+    length and token, the index keeps a bitset of the words holding it. A
+    word can only reach `cutoff` if it shares enough tokens with the query,
+    so the bitsets of the query's tokens are added up bit-sliced (a few
+    big-integer operations per token) and only the words over the needed
+    count are kept. The surviving candidates are scored with difflib, which
+    keeps the results identical to
+    `difflib.get_close_matches(word, dictionary, n=1, cutoff=cutoff)`.
+
+    arguments:
+    dictionary -- list of available words to compare
+    cutoff -- minimum similarity ratio for a match, defaulted by 0.7
+
+    >>> Corrector(["apple", "apply", "maple"]).correct("appel") → 'apple'
+    """
+
+    def __init__(self, dictionary: list[Any] | tuple[Any], cutoff: float = 0.7) -> None:
+        self.cutoff = cutoff
+        self.words: list[Any] = list(dict.fromkeys(dictionary))
+        self._bits: dict[Any, int] = {}
+        self._masks: list[int] = []
+        self._by_length: dict[int, list[int]] = {}
+
+        for i, w in enumerate(self.words):
+            self._by_length.setdefault(len(w), []).append(i)
+            mask = 0
+            for token in _tokens(w):
+                mask |= 1 << self._bits.setdefault(token, len(self._bits))
+            self._masks.append(mask)
+
+        # per length: token -> bitset of the positions in self._by_length[length]
+        self._index: dict[int, dict[Any, int]] = {}
+        for length, members in self._by_length.items():
+            rows: dict[Any, bytearray] = {}
+            size = (len(members) + 7) >> 3
+            for j, i in enumerate(members):
+                byte, bit = j >> 3, 1 << (j & 7)
+                for token in _tokens(self.words[i]):
+                    row = rows.get(token)
+                    if row is None:
+                        row = rows[token] = bytearray(size)
+                    row[byte] |= bit
+            self._index[length] = {token: int.from_bytes(row, "little") for token, row in rows.items()}
+
+        self._lengths = sorted(self._by_length)
+
+    def candidates(self, word: Any, cutoff: Optional[float] = None) -> list[tuple[float, int]]:
+        """
+        Return (upper bound, position) pairs for every word that could reach the cutoff.
+
+        The upper bound is the same value `SequenceMatcher.quick_ratio` gives.
+        """
+        if cutoff is None:
+            cutoff = self.cutoff
+        size = len(word)
+        tokens = _tokens(word)
+        query = 0
+        for token in tokens:
+            if token in self._bits:
+                query |= 1 << self._bits[token]
+
+        masks = self._masks
+        found = []
+        for length in self._lengths:
+            total = size + length
+            # a match needs at least this many shared tokens
+            needed = math.ceil(cutoff * total / 2 - 1e-9)
+            if needed > min(size, length):
+                continue
+            members = self._by_length[length]
+            if needed <= 0:
+                chosen = members
+            else:
+                index = self._index[length]
+                chosen = [members[j] for j in _set_bits(_at_least(needed, [index[t] for t in tokens if t in index]))]
+            for i in chosen:
+                found.append((2.0 * (masks[i] & query).bit_count() / total if total else 1.0, i))
+        return found
+
+    def correct(self, word: Any, alter_value: Any = None) -> Any:
+        """
+        Auto-correct the given word to its nearest match in the dictionary.
+
+        arguments:
+        word -- the word to be corrected
+        alter_value -- value to return if no match was found, returns None by default
+        """
+        s = difflib.SequenceMatcher()
+        s.set_seq2(word)
+        lcs = _LCSBound(word)
+        best = None
+        seen: set[int] = set()
+        # most typos are close to a dictionary word, so try a strict cutoff
+        # first: a smaller cutoff is only needed when nothing reached it
+        for probe in [p for p in _PROBES if p > self.cutoff] + [self.cutoff]:
+            for bound, i in sorted(self.candidates(word, probe), reverse=True):
+                if best is not None and bound < best[0]:
+                    break  # no remaining candidate can beat the best ratio
+                if i in seen:
+                    continue
+                seen.add(i)
+                candidate = self.words[i]
+                # difflib's matching blocks form a common subsequence, so the
+                # LCS gives a tighter bound than the shared characters
+                limit = lcs.ratio(candidate)
+                if limit < self.cutoff or (best is not None and limit < best[0]):
+                    continue
+                s.set_seq1(candidate)
+                rate = s.ratio()
+                # ties are broken the same way heapq.nlargest breaks them
+                if rate >= self.cutoff and (best is None or (rate, candidate) > best):
+                    best = (rate, candidate)
+            if best is not None and best[0] >= probe:
+                break
+        return best[1] if best else alter_value
+
+
+class _LCSBound:
+    """Upper bound 2·LCS/(len(a)+len(b)) of difflib's ratio against a fixed word, bit-parallel LCS."""
+
+    __slots__ = ("size", "full", "positions")
+
+    def __init__(self, word: Any) -> None:
+        self.size = len(word)
+        self.full = (1 << self.size) - 1
+        self.positions: dict[Any, int] = {}
+        for k, ch in enumerate(word):
+            self.positions[ch] = self.positions.get(ch, 0) | 1 << k
+
+    def ratio(self, other: Any) -> float:
+        total = self.size + len(other)
+        if not total:
+            return 1.0
+        v, full, positions = self.full, self.full, self.positions
+        for ch in other:
+            u = v & positions.get(ch, 0)
+            v = ((v + u) | (v - u)) & full
+        return 2.0 * (self.size - v.bit_count()) / total
+
+
+def _at_least(needed: int, bitsets: list[int]) -> int:
+    """Bitset of the positions set in at least `needed` of the bitsets."""
+    if needed > len(bitsets):
+        return 0
+    planes: list[int] = []  # bit-sliced counters, planes[k] holds bit k of every count
+    for carry in bitsets:
+        for k, plane in enumerate(planes):
+            planes[k] = plane ^ carry
+            carry &= plane
+            if not carry:
+                break
+        else:
+            planes.append(carry)
+    if needed >= 1 << len(planes):
+        return 0
+    # compare every counter with `needed`, from the highest bit down
+    above, equal = 0, -1
+    for k in range(len(planes) - 1, -1, -1):
+        if needed >> k & 1:
+            equal &= planes[k]
+        else:
+            above |= equal & planes[k]
+            equal &= ~planes[k]
+    return above | equal
+
+
+_NONZERO = re.compile(rb"[^\x00]")
+_BYTE_BITS = [tuple(b for b in range(8) if n >> b & 1) for n in range(256)]
+
+
+def _set_bits(bitset: int) -> list[int]:
+    """Positions of the set bits, scanning the bytes in C rather than bit by bit."""
+    data = bitset.to_bytes((bitset.bit_length() + 7) >> 3, "little")
+    return [m.start() << 3 | b for m in _NONZERO.finditer(data) for b in _BYTE_BITS[data[m.start()]]]
+
+
+def _tokens(word: Any) -> list[tuple[Any, int]]:
+    """Split a word into (character, occurrence) tokens."""
+    seen: dict[Any, int] = {}
+    tokens = []
+    for ch in word:
+        seen[ch] = seen.get(ch, 0) + 1
+        tokens.append((ch, seen[ch]))
+    return tokens
+
+
+_PROBES = (0.9, 0.8)
+# dictionaries smaller than this are cheaper to scan than to index
+_INDEX_MIN_SIZE = 256
+_CACHE_SIZE = 8
+_correctors: dict[int, tuple[Any, int, Corrector]] = {}
+_correctors_lock = threading.Lock()
+
+
+def _cached_corrector(dictionary: Any) -> Corrector:
+    """Return the Corrector built for this dictionary object, building it if needed."""
+    key = id(dictionary)
+    with _correctors_lock:
+        entry = _correctors.get(key)
+        if entry is not None and entry[0] is dictionary and entry[1] == len(dictionary):
+            return entry[2]
+
+    corrector = Corrector(dictionary)
+    with _correctors_lock:
+        if len(_correctors) >= _CACHE_SIZE:
+            _correctors.pop(next(iter(_correctors)))
+        _correctors[key] = (dictionary, len(dictionary), corrector)
+    return corrector
+
 
 def auto_correct(word: str, dictionary: list[Any] | tuple[Any], alter_value: Any = None) -> Any:
     """
     Auto-correct the given word to its nearest match in the given dictionary.
+
+    Large dictionaries are indexed on the first call and the index is reused
+    while the same dictionary object is passed again, as long as its length
+    did not change. Build a `Corrector` yourself if you edit the dictionary
+    in place.
     
     arguments:
     word -- the word to be corrected
@@ -15,15 +241,423 @@ def auto_correct(word: str, dictionary: list[Any] | tuple[Any], alter_value: Any
 
     >>> auto_correct("appel", ["apple", "apply", "maple"], "unknown") → 'apple'
     """
+    if len(dictionary) >= _INDEX_MIN_SIZE:
+        return _cached_corrector(dictionary).correct(word, alter_value)
     matches = difflib.get_close_matches(word, dictionary, n=1, cutoff=0.7)
     return matches[0] if matches else alter_value
 
 
+def auto_correct_many(words: Any, dictionary: list[Any] | tuple[Any] | Corrector, alter_value: Any = None,
+                      workers: Optional[int] = None, chunksize: Optional[int] = None) -> list[Any]:
+    """
+    Auto-correct many words at once, matching `auto_correct` item for item.
+
+    Every distinct word is only corrected once. With `workers`, the distinct
+    words are split across a process pool; each worker receives the index
+    once when it starts instead of once per task.
+
+    arguments:
+    words -- iterable of words to be corrected
+    dictionary -- list of available words to compare, or a prebuilt Corrector
+    alter_value -- value to return if no match was found, returns None by default
+    workers -- number of worker processes, runs in the current process by default
+    chunksize -- distinct words sent to a worker per task
+
+    >>> auto_correct_many(["appel", "mapel", "appel"], ["apple", "maple"]) → ['apple', 'maple', 'apple']
+    """
+    corrector = dictionary if isinstance(dictionary, Corrector) else _cached_corrector(dictionary)
+    words = list(words)
+    unique = list(dict.fromkeys(words))
+
+    if not workers or workers <= 1 or len(unique) < 2:
+        corrected = [corrector.correct(w) for w in unique]
+    else:
+        if chunksize is None:
+            chunksize = max(1, math.ceil(len(unique) / (workers * 4)))
+        chunks = [unique[i:i + chunksize] for i in range(0, len(unique), chunksize)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(corrector,)) as pool:
+            corrected = [c for part in pool.map(_correct_chunk, chunks) for c in part]
+
+    # a match is never None, so None marks words without a match
+    table = {w: alter_value if c is None else c for w, c in zip(unique, corrected)}
+    return [table[w] for w in words]
+
+
+# the Corrector of the current worker process, set once by _init_worker
+_worker_corrector: Optional[Corrector] = None
+
+
+def _init_worker(corrector: Corrector) -> None:
+    global _worker_corrector
+    _worker_corrector = corrector
+
+
+def _correct_chunk(words: list[Any]) -> list[Any]:
+    return [_worker_corrector.correct(w) for w in words]
+
+
+_WORD = re.compile(r"\w+")
+# distinct words remembered by correct_stream before the memo is cleared
+_MEMO_LIMIT = 100_000
+
+
+def correct_stream(source: Any, dictionary: list[Any] | tuple[Any] | Corrector, chunk_size: int = 1000,
+                   workers: Optional[int] = None, encoding: str = "utf-8") -> Iterator[str]:
+    """
+    Lazily auto-correct every word of a text stream, yielding corrected lines.
+
+    Lines are read and corrected `chunk_size` at a time, so memory stays
+    bounded no matter how large the input is. Words without a match are
+    left as they are; punctuation and whitespace are kept.
+
+    arguments:
+    source -- a file path, an open text file or any iterable of lines
+    dictionary -- list of available words to compare, or a prebuilt Corrector
+    chunk_size -- number of lines corrected per batch
+    workers -- number of worker processes, runs in the current process by default
+    encoding -- encoding used when `source` is a path
+
+    >>> list(correct_stream(["appel pie\\n"], ["apple", "pie"])) → ['apple pie\\n']
+    """
+    corrector = dictionary if isinstance(dictionary, Corrector) else _cached_corrector(dictionary)
+
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding=encoding) as file:
+            yield from correct_stream(file, corrector, chunk_size, workers)
+        return
+
+    chunks = iter(lambda it=iter(source): list(itertools.islice(it, chunk_size)), [])
+
+    if not workers or workers <= 1:
+        memo: dict[str, str] = {}
+        for lines in chunks:
+            if len(memo) > _MEMO_LIMIT:
+                memo.clear()
+            yield from _correct_lines(lines, corrector, memo)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(corrector,)) as pool:
+        pending: collections.deque = collections.deque()
+        for lines in chunks:
+            pending.append(pool.submit(_correct_lines, lines))
+            # keep a bounded number of chunks in flight, in input order
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _correct_lines(lines: list[str], corrector: Optional[Corrector] = None,
+                   memo: Optional[dict[str, str]] = None) -> list[str]:
+    corrector = corrector or _worker_corrector
+    memo = {} if memo is None else memo
+
+    def fix(match: re.Match) -> str:
+        word = match.group()
+        if word not in memo:
+            memo[word] = corrector.correct(word, word)
+        return memo[word]
+
+    return [_WORD.sub(fix, line) for line in lines]
+
+
+
+
+def similarity(string1: str, string2: str, metric: str = "ratio", cutoff: float = 0.0) -> float:
+    """
+    Return the similarity of two strings between 0 and 1.
+
+    Scores below `cutoff` are not computed exactly: as soon as a cheap upper
+    bound proves the score is below `cutoff`, that bound is returned instead.
+
+    arguments:
+    string1 -- the first string to compare
+    string2 -- the second string to compare
+    metric -- "ratio" (difflib.SequenceMatcher), "levenshtein" or "jaro_winkler"
+    cutoff -- scores below this value may be returned as an upper bound
+
+    >>> similarity("hello", "hell") → 0.8888888888888888
+    >>> similarity("hello", "hell", "levenshtein") → 0.8
+    """
+    try:
+        scorer = _METRICS[metric]
+    except KeyError:
+        raise ValueError(f"Unknown metric {metric!r}, expected one of {', '.join(_METRICS)}") from None
+    return scorer(string1, string2, cutoff)
+
+
+def _ratio(a: str, b: str, cutoff: float) -> float:
+    s = difflib.SequenceMatcher(None, a, b)
+    # length difference first, then character histograms, then the real thing
+    bound = s.real_quick_ratio()
+    if bound < cutoff:
+        return bound
+    bound = s.quick_ratio()
+    if bound < cutoff:
+        return bound
+    return s.ratio()
+
+
+def _levenshtein(a: str, b: str, cutoff: float) -> float:
+    longest = max(len(a), len(b))
+    if longest == 0:
+        return 1.0
+    # the largest distance that still reaches the cutoff
+    limit = int((1 - cutoff) * longest + 1e-9)
+    if abs(len(a) - len(b)) > limit:
+        return 1 - abs(len(a) - len(b)) / longest
+
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return 1 - (limit + 1) / longest
+        previous = current
+    return 1 - previous[-1] / longest
 
 
-def are_close(string1: str, string2: str, threshold: float, minimum: float, get_ratio: bool = False) -> Optional[Any]:
+def _jaro_winkler(a: str, b: str, cutoff: float) -> float:
+    if not a and not b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    shortest = min(len(a), len(b))
+    # every character of the shorter string matching, with a full prefix bonus
+    bound = (shortest / len(a) + shortest / len(b) + 1) / 3
+    bound += min(4, shortest) * 0.1 * (1 - bound)
+    if bound < cutoff:
+        return bound
+
+    window = max(0, max(len(a), len(b)) // 2 - 1)
+    used = [False] * len(b)
+    matched_a = []
+    for i, ch in enumerate(a):
+        for j in range(max(0, i - window), min(len(b), i + window + 1)):
+            if not used[j] and b[j] == ch:
+                used[j] = True
+                matched_a.append(ch)
+                break
+    matches = len(matched_a)
+    if not matches:
+        return 0.0
+    matched_b = [ch for j, ch in enumerate(b) if used[j]]
+    transpositions = sum(x != y for x, y in zip(matched_a, matched_b)) // 2
+
+    jaro = (matches / len(a) + matches / len(b) + (matches - transpositions) / matches) / 3
+    prefix = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefix += 1
+    return jaro + prefix * 0.1 * (1 - jaro)
+
+
+_METRICS = {"ratio": _ratio, "levenshtein": _levenshtein, "jaro_winkler": _jaro_winkler}
+
+
+def similarity_join(left: Any, right: Any = None, threshold: float = 0.8, workers: Optional[int] = None,
+                    chunksize: Optional[int] = None) -> list[tuple[int, int, float]]:
+    """
+    Find every pair of strings whose similarity ratio is at or above the threshold.
+
+    Instead of comparing every pair, `left` is indexed like in `Corrector`
+    and only pairs sharing enough characters are scored. Scores are the
+    same ratio `are_close(left[i], right[j], ...)` uses.
+
+    arguments:
+    left -- list of strings
+    right -- list of strings, compares `left` with itself (pairs i < j) by default
+    threshold -- minimum similarity ratio of a returned pair, defaulted by 0.8
+    workers -- number of worker processes, runs in the current process by default
+    chunksize -- strings of `right` sent to a worker per task
+
+    Returns (index in left, index in right, ratio) tuples sorted by index.
+
+    >>> similarity_join(["apple", "maple"], ["appel", "pear"], 0.7) → [(0, 0, 0.8)]
+    """
+    left = list(left)
+    self_join = right is None
+    right = left if self_join else list(right)
+
+    corrector = Corrector(left, cutoff=threshold)
+    positions: dict[Any, list[int]] = {}
+    for i, word in enumerate(left):
+        positions.setdefault(word, []).append(i)
+    groups = [positions[word] for word in corrector.words]
+    state = (corrector, groups, self_join)
+
+    items = list(enumerate(right))
+    if not workers or workers <= 1 or len(items) < 2:
+        pairs = _join_part(items, state)
+    else:
+        if chunksize is None:
+            chunksize = max(1, math.ceil(len(items) / (workers * 4)))
+        chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_join_worker,
+                                 initargs=(state,)) as pool:
+            pairs = [pair for part in pool.map(_join_part, chunks) for pair in part]
+    return sorted(pairs)
+
+
+def are_close_matrix(queries: Any, candidates: Any, metric: str = "ratio", cutoff: float = 0.0) -> Any:
+    """
+    Return the similarity of every query against every candidate.
+
+    Strings are encoded once into integer arrays. For "ratio", the
+    character-histogram bound is computed for all pairs at once and
+    only pairs that can reach `cutoff` get a full SequenceMatcher; the
+    other cells hold their upper bound, like `similarity` does. For
+    "levenshtein", every candidate is scored against a query in a single
+    vectorized dynamic-programming pass. Without NumPy, `similarity` is
+    called for each pair and a list of lists is returned.
+
+    arguments:
+    queries -- list of strings, one row each
+    candidates -- list of strings, one column each
+    metric -- similarity measure, see `similarity`, defaulted by "ratio"
+    cutoff -- scores below this value may be returned as an upper bound
+
+    >>> are_close_matrix(["car"], ["cat", "dog"]) → array([[0.667, 0.]])
+    """
+    queries, candidates = list(queries), list(candidates)
+    if metric not in _METRICS:
+        raise ValueError(f"Unknown metric {metric!r}, expected one of {', '.join(_METRICS)}")
+    if np is None:
+        return [[similarity(q, c, metric, cutoff) for c in candidates] for q in queries]
+
+    codes: dict[Any, int] = {}
+    encoded_q = [np.array([codes.setdefault(ch, len(codes)) for ch in q], dtype=np.int64) for q in queries]
+    encoded_c = [np.array([codes.setdefault(ch, len(codes)) for ch in c], dtype=np.int64) for c in candidates]
+    len_q = np.array([len(q) for q in queries], dtype=np.int64)
+    len_c = np.array([len(c) for c in candidates], dtype=np.int64)
+    rates = np.zeros((len(queries), len(candidates)))
+    if not queries or not candidates:
+        return rates
+
+    if metric == "levenshtein":
+        longest = max(int(len_c.max()), 1)
+        padded = np.full((len(candidates), longest), -1, dtype=np.int64)
+        for j, c in enumerate(encoded_c):
+            padded[j, :len(c)] = c
+        for i, q in enumerate(encoded_q):
+            previous = np.broadcast_to(np.arange(longest + 1), (len(candidates), longest + 1)).copy()
+            for k, ch in enumerate(q, 1):
+                current = np.empty_like(previous)
+                current[:, 0] = k
+                # substitutions and deletions are vectorized, insertions run along the row
+                current[:, 1:] = np.minimum(previous[:, 1:] + 1, previous[:, :-1] + (padded != ch))
+                for j in range(1, longest + 1):
+                    np.minimum(current[:, j], current[:, j - 1] + 1, out=current[:, j])
+                previous = current
+            distance = previous[np.arange(len(candidates)), len_c]
+            widest = np.maximum(len_c, len_q[i])
+            rates[i] = np.where(widest == 0, 1.0, 1 - distance / np.maximum(widest, 1))
+        return rates
+
+    if metric == "jaro_winkler":
+        for i, q in enumerate(queries):
+            rates[i] = [similarity(q, c, metric, cutoff) for c in candidates]
+        return rates
+
+    hist_q = np.zeros((len(queries), len(codes)), dtype=np.int32)
+    hist_c = np.zeros((len(candidates), len(codes)), dtype=np.int32)
+    for i, q in enumerate(encoded_q):
+        np.add.at(hist_q[i], q, 1)
+    for j, c in enumerate(encoded_c):
+        np.add.at(hist_c[j], c, 1)
+
+    total = len_q[:, None] + len_c[None, :]
+    safe_total = np.maximum(total, 1)
+    # quick_ratio for every pair, in blocks of rows to keep the 3-d intermediate small
+    step = max(1, 4_000_000 // max(1, len(candidates) * len(codes)))
+    for start in range(0, len(queries), step):
+        block = slice(start, start + step)
+        shared = np.minimum(hist_q[block, None, :], hist_c[None, :, :]).sum(axis=2)
+        rates[block] = np.where(total[block] == 0, 1.0, 2.0 * shared / safe_total[block])
+
+    s = difflib.SequenceMatcher()
+    for j in range(len(candidates)):
+        rows = np.nonzero(rates[:, j] >= cutoff)[0]
+        if len(rows):
+            s.set_seq2(candidates[j])
+            for i in rows:
+                s.set_seq1(queries[i])
+                rates[i, j] = s.ratio()
+    return rates
+
+
+def close_labels(rates: Any, threshold: float, minimum: float, get_ratio: bool = False) -> Any:
+    """
+    Turn a similarity matrix into `are_close` results, cell by cell.
+
+    Use `cutoff=min(threshold, minimum)` in `are_close_matrix` to get the
+    exact decisions at the lowest cost.
+
+    arguments:
+    rates -- matrix returned by `are_close_matrix`
+    threshold -- upper similarity threshold for "True"
+    minimum -- lower similarity threshold for "False"
+    get_ratio -- if True, returns percentage similarities instead of booleans, defaulted by False
+
+    >>> close_labels(are_close_matrix(["hello"], ["hell", "car"]), 0.8, 0.5) → array([[True, False]], dtype=object)
+    """
+    if np is None:
+        if get_ratio:
+            return [[f"{int(rate * 100)}%" for rate in row] for row in rates]
+        return [[True if rate >= threshold else None if minimum <= rate else False for rate in row]
+                for row in rates]
+
+    rates = np.asarray(rates, dtype=float)
+    if get_ratio:
+        return np.char.add((rates * 100).astype(np.int64).astype(str), "%")
+    labels = np.full(rates.shape, None, dtype=object)
+    labels[rates >= threshold] = True
+    labels[(rates < threshold) & (rates < minimum)] = False
+    return labels
+
+
+# the (Corrector, groups, self_join) state of the current worker process
+_join_state: Optional[tuple] = None
+
+
+def _init_join_worker(state: tuple) -> None:
+    global _join_state
+    _join_state = state
+
+
+def _join_part(items: list[tuple[int, Any]], state: Optional[tuple] = None) -> list[tuple[int, int, float]]:
+    corrector, groups, self_join = state or _join_state
+    s = difflib.SequenceMatcher()
+    scored: dict[Any, list[tuple[int, float]]] = {}
+    pairs = []
+    for j, word in items:
+        if word not in scored:
+            s.set_seq2(word)
+            matches = []
+            for _, k in corrector.candidates(word):
+                s.set_seq1(corrector.words[k])
+                rate = s.ratio()
+                if rate >= corrector.cutoff:
+                    matches.append((k, rate))
+            scored[word] = matches
+        for k, rate in scored[word]:
+            pairs.extend((i, j, rate) for i in groups[k] if not self_join or i < j)
+    return pairs
+
+
+def are_close(string1: str, string2: str, threshold: float, minimum: float, get_ratio: bool = False,
+              metric: str = "ratio") -> Optional[Any]:
     """
     Check how close two strings are.
+
+    Without get_ratio, pairs that are clearly far apart are rejected from
+    cheap upper bounds before the full score is computed.
     
     arguments:
     string1 -- the first string to compare
@@ -36,11 +670,14 @@ def are_close(string1: str, string2: str, threshold: float, minimum: float, get_
         
     get_ratio -- if True, returns percentage similarity instead of boolean, defaulted by False
 
+    metric -- similarity measure, see `similarity`, defaulted by "ratio"
+
     >>> are_close("hello", "hell", 0.8, 0.5, False) → True
     >>> are_close("car", "dog", 0.8, 0.5, True) → '33%'
     """
-    s = difflib.SequenceMatcher(None, string1, string2)
-    rate: float = s.ratio()
+    # a score below both thresholds is False whatever its exact value
+    cutoff = 0.0 if get_ratio else min(threshold, minimum)
+    rate: float = similarity(string1, string2, metric, cutoff)
 
     if not get_ratio:
         if minimum <= rate < threshold:
@@ -55,15 +692,123 @@ def are_close(string1: str, string2: str, threshold: float, minimum: float, get_
 
 
 
+class IndexedSequence(MutableSequence):
+    """
+    A list that keeps a hash map from each value to its first position.
+
+    `index()` (and so `Index()`) answers from the map in O(1). Appending
+    and removing the last item update the map in place; edits in the
+    middle shift positions, so the map is rebuilt on the next lookup.
+    Unhashable items are found by scanning, like a normal list.
+
+    >>> Index("c", IndexedSequence(["a", "b", "c"])) → 2
+    """
+
+    def __init__(self, data: Any = ()) -> None:
+        self._data = list(data)
+        self._first: dict[Any, int] = {}
+        self._stale = True
+
+    def _rebuild(self) -> None:
+        first: dict[Any, int] = {}
+        for i, item in enumerate(self._data):
+            if _is_hashable(item):  # unhashable items are found by scanning
+                first.setdefault(item, i)
+        self._first = first
+        self._stale = False
+
+    def _known(self, item: Any) -> Optional[int]:
+        return self._first.get(item) if _is_hashable(item) else None
+
+    def _lookup(self, item: Any) -> Optional[int]:
+        if not _is_hashable(item):
+            try:
+                return self._data.index(item)
+            except ValueError:
+                return None
+        if self._stale:
+            self._rebuild()
+        return self._first.get(item)
+
+    def index(self, value: Any, start: int = 0, stop: Optional[int] = None) -> int:
+        if start != 0 or stop is not None:
+            return self._data.index(value, start, len(self._data) if stop is None else stop)
+        position = self._lookup(value)
+        if position is None:
+            raise ValueError(f"{value!r} is not in IndexedSequence")
+        return position
+
+    def __contains__(self, value: Any) -> bool:
+        return self._lookup(value) is not None
+
+    def __getitem__(self, i: Any) -> Any:
+        if isinstance(i, slice):
+            return IndexedSequence(self._data[i])
+        return self._data[i]
+
+    def __setitem__(self, i: Any, value: Any) -> None:
+        if isinstance(i, slice) or self._stale:
+            self._data[i] = value
+            self._stale = True
+            return
+        i = range(len(self._data))[i]
+        old = self._data[i]
+        self._data[i] = value
+        if self._known(old) == i:
+            self._stale = True  # the next occurrence of `old` is unknown
+        elif _is_hashable(value) and self._first.get(value, i) >= i:
+            self._first[value] = i
+
+    def __delitem__(self, i: Any) -> None:
+        last = len(self._data) - 1
+        if not isinstance(i, slice) and not self._stale and range(len(self._data))[i] == last:
+            item = self._data.pop()
+            if self._known(item) == last:
+                del self._first[item]
+            return
+        del self._data[i]
+        self._stale = True
+
+    def insert(self, i: int, value: Any) -> None:
+        if i >= len(self._data) and not self._stale:
+            if _is_hashable(value):
+                self._first.setdefault(value, len(self._data))
+        else:
+            self._stale = True
+        self._data.insert(i, value)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, IndexedSequence):
+            other = other._data
+        return self._data == other
+
+    def __repr__(self) -> str:
+        return f"IndexedSequence({self._data!r})"
+
+
+def _is_hashable(item: Any) -> bool:
+    try:
+        hash(item)
+    except TypeError:
+        return False
+    return True
+
+
 def Index(item: Any, data: Any) -> Optional[int]:
     """
     Get the index of an item in a tuple/list/variable.
+
+    Wrap data you search repeatedly in an `IndexedSequence` to make each
+    lookup O(1).
     
     arguments:
     item -- the item to search for
     data -- the sequence to search in
 
-    >>> get_index("five", ("one", "two", "three", "four", "five")) → 4
+    >>> Index("five", ("one", "two", "three", "four", "five")) → 4
     """
     if isinstance(data, dict):
         raise TypeError("Can't get the index of a dict object")
@@ -76,57 +821,440 @@ def Index(item: Any, data: Any) -> Optional[int]:
 
 def location(ind: int, data: Any) -> Optional[Any]:
     """
-    Get the first occurrence of an item at a given index.
+    Get the item at a given index.
+
+    Sequences are indexed directly. Any other iterable (generators, files,
+    ...) is consumed lazily up to the requested item. Negative indices count
+    from the end; on a plain iterable they need one pass over it but only
+    keep the last `-ind` items in memory.
     
     arguments:
     ind -- index of the desired element
-    data -- the sequence to extract from
+    data -- the sequence or iterable to extract from
 
-    >>> get_location(2, ('a', 'b', 'c', 'd')) → 'c'
+    returns None if the index is out of range.
+
+    >>> location(2, ('a', 'b', 'c', 'd')) → 'c'
+    >>> location(-1, (line for line in ("x", "y"))) → 'y'
     """
     if isinstance(data, dict):
         raise TypeError("Can't get a value from a dict object by index")
-    else:
+    if hasattr(data, "__getitem__") and hasattr(data, "__len__"):
         try:
-            for i in range(len(data)):
-                if i == ind:
-                    return data[i]
-        except (ValueError, AttributeError):
+            return data[ind]
+        except IndexError:
             return None
+    if ind >= 0:
+        return next(itertools.islice(data, ind, None), None)
+    tail = collections.deque(data, maxlen=-ind)
+    return tail[0] if len(tail) == -ind else None
+
 
+get_location = location
 
 
 
-def countFreq(var: str, letters: Any) -> dict[str, int]:
+
+def countFreq(var: Any, letters: Any, overlapping: bool = False, chunk_size: int = 1 << 24,
+              workers: Optional[int] = None, encoding: str = "utf-8") -> dict[str, int]:
     """
     Returns the frequency of the given letters in the given text.
+
+    All letters are counted together: many single characters share one
+    Counter pass and many longer substrings share one Aho-Corasick pass,
+    while a handful of letters use C-level str.count.
+
+    Files and buffers are never loaded whole: they are counted `chunk_size`
+    at a time, and occurrences crossing a chunk boundary are counted once.
+    For a file path, `workers` processes count the chunks in parallel;
+    buffers and open files can't be reopened in a worker, so they are
+    always counted in the current process and `workers` is ignored.
     
     arguments:
-    var -- The text to analyze.
+    var -- The text to analyze. Can be a str, list, tuple, a file path
+           (os.PathLike), an open file, or a bytes-like buffer (bytes,
+           bytearray, memoryview, mmap).
     letters -- The letters to count. Can be a string, tuple, or list.
+    overlapping -- count overlapping occurrences of substrings, defaulted by False (like str.count)
+    chunk_size -- size of the chunks files and buffers are read in
+    workers -- number of worker processes for file paths (only), counts in the current process by default
+    encoding -- encoding of the letters when counting in binary data
         
         
     >>> countFreq("independent", ("i", "e", "d")) → {'i': 1, 'e': 3, 'd': 2}
+    >>> countFreq("aaaa", "aa", overlapping=True) → {'aa': 3}
+    >>> countFreq(pathlib.Path("corpus.txt"), "the", workers=4) → {'the': 1843}
     """
 
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise ValueError(f"chunk_size must be a positive int, got {chunk_size!r}")
+
     # Handle invalid inputs
     if not isinstance(var, (str, list, tuple)):
-        raise TypeError("var parameter must be a str, list, or a tuple.")
+        if isinstance(var, (os.PathLike, bytes, bytearray, memoryview, mmap.mmap)) or hasattr(var, "read"):
+            if isinstance(letters, str):
+                letters = [letters]
+            patterns = list(dict.fromkeys(l for l in letters if isinstance(l, str) and len(l) > 0))
+            return _count_source(var, patterns, overlapping, chunk_size, workers, encoding)
+        raise TypeError("var parameter must be a str, list, tuple, file, path or bytes-like buffer.")
 
     # Convert single string input to iterable
     if isinstance(letters, str):
         letters = [letters]
 
-    # Count frequency
-    result = {}
-    for l in letters:
-        if not isinstance(l, str) or len(l) == 0:
-            continue  # ignore invalid entries
-        result[l] = var.count(l)
+    # ignore invalid entries
+    patterns = list(dict.fromkeys(l for l in letters if isinstance(l, str) and len(l) > 0))
 
+    return _count_patterns(var, patterns, overlapping)
+
+
+# below these numbers of patterns, one C-level count per pattern is faster
+# than a single pass over the text in Python
+_COUNTER_MIN_PATTERNS = 64
+_AUTOMATON_MIN_PATTERNS = 256
+
+
+def _count_patterns(var: Any, patterns: list[Any], overlapping: bool = False) -> dict[Any, int]:
+    """Count every pattern in var, with the cheapest strategy for their number."""
+    if not isinstance(var, (str, bytes)):
+        # in a list or tuple, a pattern is a whole element
+        if len(patterns) >= _COUNTER_MIN_PATTERNS:
+            try:
+                counter = collections.Counter(var)
+                return {p: counter[p] for p in patterns}
+            except TypeError:
+                pass  # unhashable elements
+        return {p: var.count(p) for p in patterns}
+
+    result = dict.fromkeys(patterns, 0)
+    singles = [p for p in patterns if len(p) == 1]
+    longer = [p for p in patterns if len(p) > 1]
+
+    if len(singles) >= _COUNTER_MIN_PATTERNS:
+        counter = collections.Counter(var)
+        for p in singles:
+            # iterating bytes yields ints
+            result[p] = counter[p if isinstance(p, str) else p[0]]
+    else:
+        for p in singles:
+            result[p] = var.count(p)
+
+    if len(longer) >= _AUTOMATON_MIN_PATTERNS:
+        result.update(_Automaton(longer).count(var, overlapping))
+    else:
+        for p in longer:
+            # without a border, occurrences can never overlap
+            result[p] = _count_overlapping(var, p) if overlapping and _has_border(p) else var.count(p)
     return result
 
 
+def _has_border(pattern: Any) -> bool:
+    """Whether a proper prefix of the pattern is also its suffix."""
+    return any(pattern[:k] == pattern[-k:] for k in range(1, len(pattern)))
+
+
+def _count_overlapping(text: Any, pattern: Any) -> int:
+    n, i = 0, text.find(pattern)
+    while i != -1:
+        n += 1
+        i = text.find(pattern, i + 1)
+    return n
+
+
+def _count_source(source: Any, patterns: list[str], overlapping: bool, chunk_size: int,
+                  workers: Optional[int], encoding: str) -> dict[str, int]:
+    """Count patterns in a file, path or buffer chunk by chunk."""
+    binary = not isinstance(source, io.TextIOBase)
+    keys = {p.encode(encoding) if binary else p: p for p in patterns}
+    encoded = list(keys)
+    # each chunk is read with enough extra data to finish any occurrence starting in it
+    extra = max((len(p) for p in encoded), default=1) - 1
+
+    if isinstance(source, os.PathLike) and workers and workers > 1:
+        totals = _count_file_parallel(source, encoded, overlapping, chunk_size, extra, workers)
+    elif isinstance(source, os.PathLike):
+        with open(source, "rb") as file:
+            totals = _count_chunks(_file_windows(file, chunk_size, extra), encoded, overlapping)
+    elif hasattr(source, "read"):
+        totals = _count_chunks(_file_windows(source, chunk_size, extra), encoded, overlapping)
+    else:
+        totals = _count_chunks(_buffer_windows(source, chunk_size, extra), encoded, overlapping)
+    return {keys[p]: n for p, n in totals.items()}
+
+
+def _buffer_windows(buffer: Any, chunk_size: int, extra: int) -> Iterator[tuple[int, Any, int]]:
+    """Yield (start, chunk plus `extra` following items, chunk size) windows of a buffer."""
+    total = len(buffer) if not isinstance(buffer, memoryview) else buffer.nbytes
+    if isinstance(buffer, memoryview):
+        buffer = buffer.cast("B")
+    for start in range(0, total, chunk_size):
+        window = bytes(buffer[start:start + chunk_size + extra])
+        yield start, window, min(chunk_size, total - start)
+
+
+def _file_windows(file: Any, chunk_size: int, extra: int) -> Iterator[tuple[int, Any, int]]:
+    """Yield (start, chunk plus `extra` following items, chunk size) windows of an open file."""
+    window = file.read(chunk_size + extra)
+    start = 0
+    while window:
+        size = min(chunk_size, len(window))
+        yield start, window, size
+        start += size
+        window = window[size:] + file.read(chunk_size)
+
+
+def _count_chunks(windows: Iterator[tuple[int, Any, int]], patterns: list[Any],
+                  overlapping: bool) -> dict[Any, int]:
+    """Add up the counts of consecutive windows."""
+    greedy = _greedy_patterns(patterns, overlapping)
+    totals = dict.fromkeys(patterns, 0)
+    # where the next non-overlapping occurrence of each greedy pattern may start
+    free = dict.fromkeys(greedy, 0)
+    for start, window, size in windows:
+        entries = {p: max(0, free[p] - start) for p in greedy}
+        counts, ends = _count_window(window, size, patterns, overlapping, entries)
+        for p, n in counts.items():
+            totals[p] += n
+        for p, end in ends.items():
+            free[p] = start + end
+    return totals
+
+
+def _greedy_patterns(patterns: list[Any], overlapping: bool) -> list[Any]:
+    """
+    Patterns whose non-overlapping count depends on where counting started.
+
+    Only patterns with a border can overlap themselves, so only they need
+    to know whether an occurrence from the previous chunk is still running.
+    """
+    if overlapping:
+        return []
+    return [p for p in patterns if len(p) > 1 and _has_border(p)]
+
+
+def _count_window(window: Any, size: int, patterns: list[Any], overlapping: bool,
+                  entries: dict[Any, int]) -> tuple[dict[Any, int], dict[Any, int]]:
+    """
+    Count the occurrences starting in the first `size` items of a window.
+
+    `entries` gives, for each greedy pattern, the offset at which counting
+    starts. Returns the counts and, for each greedy pattern, the offset
+    right after its last counted occurrence.
+    """
+    plain = [p for p in patterns if p not in entries]
+    counts = _count_patterns(window, plain, overlapping)
+    if len(window) > size:
+        # occurrences entirely inside the extra data belong to the next chunk
+        for p, n in _count_patterns(window[size:], plain, overlapping).items():
+            counts[p] -= n
+
+    ends = {}
+    for p, entry in entries.items():
+        stop = size + len(p) - 1
+        counts[p] = window.count(p, entry, stop)
+        ends[p] = _greedy_end(window, p, entry, stop)
+    return counts, ends
+
+
+def _greedy_end(buffer: Any, pattern: Any, start: int, stop: int) -> int:
+    """End of the last occurrence str.count would count in buffer[start:stop], or start."""
+    last = buffer.rfind(pattern, start, stop)
+    if last == -1:
+        return start
+    # the last counted occurrence overlaps the last occurrence, so it is one
+    # of the few occurrences starting less than len(pattern) before it
+    candidates = []
+    i = buffer.find(pattern, max(start, last - len(pattern) + 1), stop)
+    while i != -1:
+        candidates.append(i)
+        i = buffer.find(pattern, i + 1, stop)
+    total = buffer.count(pattern, start, stop)
+    for c in candidates[:-1]:
+        if buffer.count(pattern, start, c + len(pattern)) == total:
+            return c + len(pattern)
+    return candidates[-1] + len(pattern)
+
+
+def _count_file_parallel(path: Any, patterns: list[bytes], overlapping: bool, chunk_size: int,
+                         extra: int, workers: int) -> dict[bytes, int]:
+    """Count the chunks of a file in worker processes, then stitch their boundaries."""
+    total = os.path.getsize(path)
+    starts = list(range(0, total, chunk_size))
+    greedy = _greedy_patterns(patterns, overlapping)
+    jobs = [(path, start, chunk_size, extra, patterns, overlapping) for start in starts]
+
+    totals = dict.fromkeys(patterns, 0)
+    free = dict.fromkeys(greedy, 0)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for start, (counts, ends) in zip(starts, pool.map(_count_file_chunk, jobs)):
+            for p in patterns:
+                if p not in free:
+                    totals[p] += counts[p]
+                    continue
+                if free[p] > start:
+                    # the worker assumed no occurrence ran into this chunk
+                    job = (path, start, chunk_size, extra, [p], overlapping)
+                    redone, redone_ends = _count_file_chunk(job, {p: free[p] - start})
+                    counts[p], ends[p] = redone[p], redone_ends[p]
+                totals[p] += counts[p]
+                free[p] = start + ends[p]
+    return totals
+
+
+def _count_file_chunk(job: tuple, entries: Optional[dict[bytes, int]] = None) -> tuple[dict, dict]:
+    path, start, chunk_size, extra, patterns, overlapping = job
+    with open(path, "rb") as file:
+        file.seek(start)
+        window = file.read(chunk_size + extra)
+    size = min(chunk_size, len(window))
+    if entries is None:
+        entries = dict.fromkeys(_greedy_patterns(patterns, overlapping), 0)
+    return _count_window(window, size, patterns, overlapping, entries)
+
+
+class _Automaton:
+    """Aho-Corasick automaton counting many substrings in a single pass."""
+
+    def __init__(self, patterns: list[Any]) -> None:
+        self.patterns = patterns
+        self.lengths = [len(p) for p in patterns]
+        self.goto: list[dict[Any, int]] = [{}]
+        self.fail = [0]
+        self.out: list[list[int]] = [[]]
+
+        for pid, pattern in enumerate(patterns):
+            state = 0
+            for ch in pattern:
+                if ch not in self.goto[state]:
+                    self.goto[state][ch] = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = self.goto[state][ch]
+            self.out[state].append(pid)
+
+        queue = collections.deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def count(self, text: Any, overlapping: bool = False) -> dict[Any, int]:
+        goto, fail, out, lengths = self.goto, self.fail, self.out, self.lengths
+        counts = [0] * len(self.patterns)
+        # position where the next non-overlapping occurrence may start
+        free = [0] * len(self.patterns)
+        state = 0
+        for pos, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for pid in out[state]:
+                    if overlapping:
+                        counts[pid] += 1
+                    elif pos - lengths[pid] + 1 >= free[pid]:
+                        counts[pid] += 1
+                        free[pid] = pos + 1
+        return dict(zip(self.patterns, counts))
+
+
+class FrequencyTracker:
+    """
+    Keep countFreq results up to date while text keeps arriving.
+
+    Each `feed` only counts the new text (plus the few characters before it
+    needed to finish an occurrence), and an occurrence is counted by the
+    feed that delivers its last character. With `max_chunks` or `max_age`,
+    the counts only cover the most recent feeds.
+
+    arguments:
+    letters -- The letters to count. Can be a string, tuple, or list.
+    overlapping -- count overlapping occurrences of substrings, defaulted by False (like str.count)
+    max_chunks -- only keep the counts of the last `max_chunks` feeds
+    max_age -- only keep the counts of feeds from the last `max_age` seconds
+
+    >>> tracker = FrequencyTracker(("e", "ab"))
+    >>> tracker.feed("a"); tracker.feed("bee")
+    >>> tracker.snapshot() → {'e': 2, 'ab': 1}
+    """
+
+    def __init__(self, letters: Any, overlapping: bool = False, max_chunks: Optional[int] = None,
+                 max_age: Optional[float] = None) -> None:
+        if isinstance(letters, str):
+            letters = [letters]
+        self.patterns = list(dict.fromkeys(l for l in letters if isinstance(l, str) and len(l) > 0))
+        self.overlapping = overlapping
+        self.max_chunks = max_chunks
+        self.max_age = max_age
+
+        self._greedy = _greedy_patterns(self.patterns, overlapping)
+        self._plain = [p for p in self.patterns if p not in self._greedy]
+        self._extra = max((len(p) for p in self.patterns), default=1) - 1
+        self._totals = dict.fromkeys(self.patterns, 0)
+        self._free = dict.fromkeys(self._greedy, 0)
+        self._tail = ""
+        self._position = 0
+        self._history: collections.deque = collections.deque()
+
+    def feed(self, chunk: str) -> None:
+        """Count the occurrences completed by a new chunk of text."""
+        window = self._tail + chunk
+        offset = self._position - len(self._tail)
+
+        counts = _count_patterns(window, self._plain, self.overlapping)
+        # occurrences entirely inside the tail were counted by the previous feed
+        for p, n in _count_patterns(self._tail, self._plain, self.overlapping).items():
+            counts[p] -= n
+        for p in self._greedy:
+            entry = max(0, self._free[p] - offset)
+            counts[p] = window.count(p, entry)
+            self._free[p] = offset + _greedy_end(window, p, entry, len(window))
+
+        for p, n in counts.items():
+            self._totals[p] += n
+        self._tail = window[max(0, len(window) - self._extra):]
+        self._position += len(chunk)
+
+        if self.max_chunks is not None or self.max_age is not None:
+            self._history.append((time.monotonic(), counts))
+            while self.max_chunks is not None and len(self._history) > self.max_chunks:
+                self.evict()
+            self._expire()
+
+    def evict(self, chunk: Optional[str] = None) -> None:
+        """
+        Remove counts from the tracker.
+
+        arguments:
+        chunk -- text whose occurrences are removed; removes the oldest
+                 recorded feed when omitted (requires max_chunks or max_age)
+        """
+        if chunk is None:
+            _, counts = self._history.popleft()
+        else:
+            counts = _count_patterns(chunk, self.patterns, self.overlapping)
+        for p, n in counts.items():
+            self._totals[p] -= n
+
+    def _expire(self) -> None:
+        if self.max_age is None:
+            return
+        limit = time.monotonic() - self.max_age
+        while self._history and self._history[0][0] < limit:
+            self.evict()
+
+    def snapshot(self) -> dict[str, int]:
+        """Return the current counts in the same shape as countFreq."""
+        self._expire()
+        return dict(self._totals)
+
+
 
 def flash_text(phrase: str, delay: float = 0.5) -> None:
     """Write a text then delete (works mostly in Terminal & might fail in some environments)."""
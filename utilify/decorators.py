@@ -1,39 +1,321 @@
-import time, os, contextlib, base64
-from typing import Any, Optional 
+import time, os, contextlib, base64, threading, asyncio, inspect, hashlib, pickle, sqlite3, random, logging
+import cProfile, pstats, tracemalloc, io, heapq, itertools, zlib, codecs
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
+from typing import Any, Callable, Iterator, Optional 
 from functools import wraps
 
-def timer(func: Any) -> Any:
-    """A decorator returning functions' elapsing time
-    • Note: any function with this decorator won't return the code in the function, only the time taken.
-    
+def timer(func: Optional[Callable] = None, *, sink: Any = "print", sample_rate: float = 1.0,
+          quiet: bool = False) -> Any:
+    """A decorator timing every call of a function and keeping statistics of the durations.
+    The wrapped function still returns its result.
+
+    arguments:
+    sink -- where each duration goes: "print" (seconds, as before), a logging.Logger (debug level),
+            a callable taking (function name, nanoseconds), or None to only keep statistics
+    sample_rate -- fraction of the calls that are timed
+    quiet -- silence stdout/stderr of the function while it runs
+
+    Coroutine functions are timed from the first await to their result.
+    The wrapper's stats() gives count, mean, p50, p95, p99 and max in seconds,
+    percentiles are read from a log-scaled histogram (within ~7%).
+
     >>>
-    	@timer
+    	@timer(sink=None)
     	def timed():
     		for i in range(999999):
-    			print(i)
-    	
-    	timed() → 6.5043
+    			pass
+
+    	timed()
+    	timed.stats() → {'count': 1, 'mean': 0.0174, 'p50': 0.0172, 'p95': 0.0172, 'p99': 0.0172, 'max': 0.0174}
     """
-    @wraps(func)
-    def wrapper(*args: Any, **kwargs: Any) -> None:
-        start = time.time()
-        with open(os.devnull, "w") as devnull:
-            with contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+    if func is None:
+        return lambda func: timer(func, sink=sink, sample_rate=sample_rate, quiet=quiet)
+
+    timings = _Timings()
+    report = _sink(sink, func.__qualname__)
+    clock, record = time.perf_counter_ns, timings.add
+
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if sample_rate < 1.0 and random.random() >= sample_rate:
+                return await func(*args, **kwargs)
+            start = clock()
+            try:
+                if quiet:
+                    with _silenced():
+                        return await func(*args, **kwargs)
+                return await func(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                record(elapsed)
+                if report is not None:
+                    report(elapsed)
+    else:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if sample_rate < 1.0 and random.random() >= sample_rate:
+                return func(*args, **kwargs)
+            start = clock()
+            try:
+                if quiet:
+                    with _silenced():
+                        return func(*args, **kwargs)
+                return func(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                record(elapsed)
+                if report is not None:
+                    report(elapsed)
+
+    wrapper.stats = timings.summary
+    wrapper.stats_reset = timings.reset
+    return wrapper
+
+
+class _Timings:
+    """Count, total, max and a log-scaled histogram of durations in nanoseconds.
+
+    Calls only append to a pending list (atomic under the GIL), which is folded
+    into the histogram in batches, so timing doesn't take a lock per call.
+    """
+
+    _SUB = 3  # 8 buckets per power of two
+    _BATCH = 4096
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.pending: list[int] = []
+        self.reset()
+
+    def reset(self) -> None:
+        with self.lock:
+            del self.pending[:]
+            self.count = self.total = self.max = 0
+            self.buckets = [0] * (64 << self._SUB)
+
+    def add(self, ns: int) -> None:
+        pending = self.pending
+        pending.append(ns)
+        if len(pending) >= self._BATCH:
+            self.fold()
+
+    def fold(self) -> None:
+        sub, mask, buckets = self._SUB, (1 << self._SUB) - 1, self.buckets
+        with self.lock:
+            n = len(self.pending)
+            batch = self.pending[:n]
+            del self.pending[:n]
+            for ns in batch:
+                bits = ns.bit_length()
+                buckets[ns if bits <= sub + 1 else (bits - sub) << sub | (ns >> (bits - sub - 1)) & mask] += 1
+            self.count += n
+            self.total += sum(batch)
+            self.max = max(self.max, max(batch, default=0))
+
+    def _value(self, index: int) -> float:
+        """Midpoint of a bucket, in nanoseconds."""
+        shift = (index >> self._SUB) - 1
+        if shift < 1:
+            return float(index)
+        low = ((1 << self._SUB) | index & ((1 << self._SUB) - 1)) << shift
+        return low + (1 << shift) / 2
+
+    def summary(self) -> dict[str, float]:
+        self.fold()
+        with self.lock:
+            count, total, top, buckets = self.count, self.total, self.max, list(self.buckets)
+        stats = {"count": count, "mean": total / count / 1e9 if count else 0.0}
+        for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            rank, seen = q * count, 0
+            value = 0.0
+            for index, n in enumerate(buckets):
+                seen += n
+                if n and seen >= rank:
+                    value = min(self._value(index), top)
+                    break
+            stats[name] = value / 1e9
+        stats["max"] = top / 1e9
+        return stats
+
+
+def _sink(sink: Any, name: str) -> Optional[Callable[[int], None]]:
+    if sink is None:
+        return None
+    if sink == "print":
+        return lambda ns: print(f"{ns / 1e9:.4f}")
+    if isinstance(sink, logging.Logger):
+        return lambda ns: sink.debug("%s took %.6fs", name, ns / 1e9)
+    if callable(sink):
+        return lambda ns: sink(name, ns)
+    raise TypeError(f"unsupported timer sink {sink!r}")
+
+
+@contextlib.contextmanager
+def _silenced() -> Iterator[None]:
+    with open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+            yield
+
+
+
+_PROFILING = os.environ.get("UTILIFY_PROFILE", "0").lower() not in ("", "0", "false", "no", "off")
+_PROFILE_LOCK = threading.Lock()
+
+
+def set_profiling(enabled: bool) -> None:
+    """Turns every @profiled function on or off at runtime (the default comes from $UTILIFY_PROFILE)."""
+    global _PROFILING
+    _PROFILING = bool(enabled)
+
+
+def profiled(func: Optional[Callable] = None, *, sample_rate: float = 1.0, cpu: bool = True,
+             memory: bool = False) -> Any:
+    """A decorator profiling a function with cProfile and/or tracemalloc, aggregated across calls.
+    It only profiles while profiling is on, see set_profiling and $UTILIFY_PROFILE.
+
+    arguments:
+    sample_rate -- fraction of the calls that are profiled
+    cpu -- capture cProfile call statistics
+    memory -- capture tracemalloc allocations by line
+
+    One call is profiled at a time, nested or concurrent calls meanwhile run unprofiled.
+    A coroutine function is profiled from its first step to its result, which includes
+    whatever other tasks the event loop runs while it awaits.
+    The wrapper has report(top=20), dump_stats(path) and profile_reset().
+
+    >>>
+    	@profiled(memory=True)
+    	def correct(words):
+    		return [auto_correct(word, dictionary) for word in words]
+
+    	set_profiling(True)
+    	correct(words)
+    	print(correct.report(top=10))
+    """
+    if func is None:
+        return lambda func: profiled(func, sample_rate=sample_rate, cpu=cpu, memory=memory)
+
+    profile = _Profile(func.__qualname__)
+
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _PROFILING or (sample_rate < 1.0 and random.random() >= sample_rate):
+                return await func(*args, **kwargs)
+            if not _PROFILE_LOCK.acquire(blocking=False):
+                return await func(*args, **kwargs)
+            try:
+                state = profile.start(cpu, memory)
                 try:
-                    func(*args, **kwargs)
-                except Exception:
-                    end = time.time()
-                    print(f"{end - start:.4f}")
-                    raise
-        end = time.time()
-        print(f"{end - start:.4f}")
+                    return await func(*args, **kwargs)
+                finally:
+                    profile.stop(state)
+            finally:
+                _PROFILE_LOCK.release()
+    else:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _PROFILING or (sample_rate < 1.0 and random.random() >= sample_rate):
+                return func(*args, **kwargs)
+            if not _PROFILE_LOCK.acquire(blocking=False):
+                return func(*args, **kwargs)
+            try:
+                state = profile.start(cpu, memory)
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    profile.stop(state)
+            finally:
+                _PROFILE_LOCK.release()
 
+    wrapper.report = profile.report
+    wrapper.dump_stats = profile.dump_stats
+    wrapper.profile_reset = profile.reset
     return wrapper
 
 
+class _Profile:
+    """cProfile statistics and tracemalloc allocations summed over the profiled calls."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.reset()
+
+    def reset(self) -> None:
+        self.calls = 0
+        self.stats: Optional[pstats.Stats] = None
+        self.allocations: dict[str, list[int]] = {}
+        self.peak = 0
+
+    def start(self, cpu: bool, memory: bool) -> tuple:
+        started = memory and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        before = None
+        if memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+        profiler = cProfile.Profile() if cpu else None
+        if profiler is not None:
+            profiler.enable()
+        return profiler, before, started
+
+    def stop(self, state: tuple) -> None:
+        profiler, before, started = state
+        if profiler is not None:
+            profiler.disable()
+        self.calls += 1
+        if before is not None:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            after = tracemalloc.take_snapshot()
+            if started:
+                tracemalloc.stop()
+            for diff in after.compare_to(before, "lineno"):
+                if diff.size_diff or diff.count_diff:
+                    where = str(diff.traceback[0])
+                    totals = self.allocations.setdefault(where, [0, 0])
+                    totals[0] += diff.size_diff
+                    totals[1] += diff.count_diff
+        if profiler is not None:
+            profiler.create_stats()
+            if self.stats is None:
+                self.stats = pstats.Stats(profiler)
+            else:
+                self.stats.add(profiler)
+
+    def dump_stats(self, path: str | os.PathLike) -> None:
+        if self.stats is None:
+            raise ValueError(f"no cProfile statistics collected for {self.name}")
+        self.stats.dump_stats(os.fspath(path))
+
+    def report(self, top: int = 20, sort: str = "cumulative") -> str:
+        out = io.StringIO()
+        out.write(f"{self.name}: {self.calls} profiled call(s)\n")
+        if self.stats is not None:
+            self.stats.stream = out
+            self.stats.sort_stats(sort).print_stats(top)
+        if self.allocations:
+            out.write(f"peak traced memory: {self.peak} B\ntop allocations (net bytes, blocks):\n")
+            lines = sorted(self.allocations.items(), key=lambda item: -abs(item[1][0]))[:top]
+            for where, (size, count) in lines:
+                out.write(f"  {where}: {size:+} B, {count:+}\n")
+        return out.getvalue()
+
+
+
+def run_once(func: Optional[Callable] = None, *, mode: str = "raise") -> Any | None:
+    """A decorator preventing calling a function (or coroutine function) more than once
+
+    arguments:
+    mode -- "raise": later calls raise an Exception, as a guard against running twice
+            "return": later calls return the first call's result, a lazy one-time initializer;
+            calls made while the first one runs wait for it instead of running again
+
+    A first call that raises doesn't count, the next call runs the function again.
+    The wrapper's reset() allows one more run.
 
-def run_once(func: Any) -> Any | None:
-    """A decorator preventing calling a function more than once
     >>>
     	@run_once
     	def temp():
@@ -41,51 +323,1110 @@ def run_once(func: Any) -> Any | None:
     		
     	temp() → 'Hello world'
     	temp() → Exception: Function 'temp' can only run once.
+
+    	@run_once(mode="return")
+    	def load():
+    		return open("words.txt").read().split()
+
+    	load() is load() → True
     """
-    called = False
-    result = None
-    wraps(func)
-    def wrapper(*args, **kwargs):
-        nonlocal called, result
-        if not called:
-            result = func(*args, **kwargs)
-            called = True
-        else:
-            raise Exception(f"Function '{func.__name__}' can only run once.")
-        return result
+    if mode not in ("raise", "return"):
+        raise ValueError(f"unknown run_once mode {mode!r}, use 'raise' or 'return'")
+    if func is None:
+        return lambda func: run_once(func, mode=mode)
+
+    once = _Once(func.__name__, mode)
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            with once.lock:
+                task = once.claim()
+                if task is None:
+                    task = once.call = asyncio.ensure_future(func(*args, **kwargs))
+                    task.add_done_callback(once.settle_task)
+                    first = True
+                else:
+                    first = False
+            if first or not task.done():
+                return await asyncio.shield(task)
+            return task.result()
+    else:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with once.lock:
+                call = once.claim()
+                if call is None:
+                    call = once.call = _Call()
+                    first = True
+                else:
+                    first = False
+            if not first:
+                return call.wait()
+            try:
+                call.result = func(*args, **kwargs)
+            except BaseException as error:
+                call.error = error
+                raise
+            finally:
+                once.settle(call)
+            return call.result
+
+    wrapper.reset = once.reset
     return wrapper
 
 
+class _Once:
+    """The state of a run_once function: its first call (running or done) or None."""
+
+    def __init__(self, name: str, mode: str) -> None:
+        self.name = name
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.call: Any = None
+
+    def claim(self) -> Any:
+        """The first call to wait for, None when this caller runs the function; raises in "raise" mode."""
+        if self.call is not None and self.mode == "raise":
+            raise Exception(f"Function '{self.name}' can only run once.")
+        return self.call
+
+    def settle(self, call: "_Call") -> None:
+        if call.error is not None:
+            with self.lock:
+                if self.call is call:
+                    self.call = None
+        call.done.set()
+
+    def settle_task(self, task: "asyncio.Future") -> None:
+        if task.cancelled() or task.exception() is not None:
+            with self.lock:
+                if self.call is task:
+                    self.call = None
+
+    def reset(self) -> None:
+        with self.lock:
+            self.call = None
 
-def delayed(seconds: int) -> Any | None:
-    """Delays the function when called for the given time."""
+
+
+def delayed(seconds: float, scheduled: bool = False) -> Any | None:
+    """Delays the function when called for the given time and returns its result.
+
+    arguments:
+    seconds -- the delay
+    scheduled -- return a concurrent.futures.Future at once instead of sleeping, the call is run
+                 on a thread pool when due by a single scheduler thread, so no thread sits waiting
+
+    Coroutine functions wait with asyncio.sleep, without blocking the event loop.
+
+    >>>
+    	@delayed(2, scheduled=True)
+    	def ping():
+    		return "pong"
+
+    	ping().result() → 'pong' (after 2 seconds)
+    """
     def decorator(func):
-        def wrapper(*args, **kwargs):
-            time.sleep(seconds)
-            func(*args, **kwargs)
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                await asyncio.sleep(seconds)
+                return await func(*args, **kwargs)
+        elif scheduled:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                return _scheduler().schedule(seconds, func, args, kwargs)
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                time.sleep(seconds)
+                return func(*args, **kwargs)
         return wrapper
     return decorator
+
+
+class _Scheduler:
+    """A heap of due times served by one daemon thread, which hands due calls to a thread pool."""
+
+    def __init__(self) -> None:
+        self.heap: list = []
+        self.order = itertools.count()
+        self.ready = threading.Condition()
+        self.pool = ThreadPoolExecutor(thread_name_prefix="utilify-delayed")
+        threading.Thread(target=self.loop, name="utilify-scheduler", daemon=True).start()
+
+    def schedule(self, seconds: float, func: Callable, args: tuple, kwargs: dict) -> Future:
+        future: Future = Future()
+        with self.ready:
+            heapq.heappush(self.heap, (time.monotonic() + seconds, next(self.order), future, func, args, kwargs))
+            self.ready.notify()
+        return future
+
+    def loop(self) -> None:
+        while True:
+            with self.ready:
+                while not self.heap or self.heap[0][0] > time.monotonic():
+                    self.ready.wait(self.heap[0][0] - time.monotonic() if self.heap else None)
+                _, _, future, func, args, kwargs = heapq.heappop(self.heap)
+            if future.set_running_or_notify_cancel():
+                self.pool.submit(_settle, future, func, args, kwargs)
+
+
+def _settle(future: Future, func: Callable, args: tuple, kwargs: dict) -> None:
+    try:
+        future.set_result(func(*args, **kwargs))
+    except BaseException as error:
+        future.set_exception(error)
+
+
+_SCHEDULER: Optional[_Scheduler] = None
+_SCHEDULER_LOCK = threading.Lock()
+
+
+def _scheduler() -> _Scheduler:
+    global _SCHEDULER
+    with _SCHEDULER_LOCK:
+        if _SCHEDULER is None:
+            _SCHEDULER = _Scheduler()
+        return _SCHEDULER
     
     
 
-def encrypted(func: Any) -> Any | None:
-    """Encrypts the function to the base64 cipher.
-    
+def encrypted(func: Optional[Callable] = None, *, codec: str = "base64", compress: bool = False,
+              chunk_size: int = 1 << 20) -> Any | None:
+    """Encrypts the result of the function (or coroutine function) to the base64 cipher.
+
+    arguments:
+    codec -- "base64", "urlsafe" (URL-safe base64) or "base85"
+    compress -- zlib-compress the payload before encoding it
+    chunk_size -- bytes encoded at a time for streamed results
+
+    str results are UTF-8 encoded, bytes, bytearray and memoryview results are encoded without copying.
+    Generators and other iterators (of str or bytes) give back an iterator of encoded str chunks, encoded
+    lazily in blocks aligned to the codec, so the chunks join to the encoding of the whole stream.
+    None stays None, other results (lists, dicts, numbers...) raise TypeError.
+
     >>>
     	@encrypted
     	def example():
-    		print("Hello world")
+    		return "Hello world"
     	
     	example() → 'SGVsbG8gd29ybGQ='
     """
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        result = func(*args, **kwargs)
-        try:
-        	encoded = base64.b64encode(result.encode()).decode()
-        except AttributeError:
-        	return None
-        return encoded
+    if func is None:
+        return lambda func: encrypted(func, codec=codec, compress=compress, chunk_size=chunk_size)
+    encode = _Codec(codec, compress).encode_result
+    return _map_result(func, lambda result: encode(result, chunk_size))
+
+
+
+def decrypted(func: Optional[Callable] = None, *, codec: str = "base64", compress: bool = False,
+              encoding: Optional[str] = None, chunk_size: int = 1 << 20) -> Any | None:
+    """Decrypts the result of the function (or coroutine function) from the cipher of @encrypted.
+
+    arguments:
+    codec, compress -- as given to @encrypted
+    encoding -- decode the payload to str with this encoding, bytes are returned when None
+    chunk_size -- characters decoded at a time for streamed results
+
+    >>>
+    	@decrypted(encoding="utf-8")
+    	def example():
+    		return "SGVsbG8gd29ybGQ="
+
+    	example() → 'Hello world'
+    """
+    if func is None:
+        return lambda func: decrypted(func, codec=codec, compress=compress, encoding=encoding, chunk_size=chunk_size)
+    decode = _Codec(codec, compress).decode_result
+    return _map_result(func, lambda result: decode(result, encoding, chunk_size))
+
+
+def _map_result(func: Callable, convert: Callable[[Any], Any]) -> Callable:
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            return convert(await func(*args, **kwargs))
+    else:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return convert(func(*args, **kwargs))
     return wrapper
- 
- 
+
+
+class _Codec:
+    """A binary-to-text codec with optional zlib compression, for whole payloads or streams."""
+
+    _CODECS = {
+        # name: (bytes per block, characters per block, encoder, decoder)
+        "base64": (3, 4, base64.b64encode, base64.b64decode),
+        "urlsafe": (3, 4, base64.urlsafe_b64encode, base64.urlsafe_b64decode),
+        "base85": (4, 5, base64.b85encode, base64.b85decode),
+    }
+
+    def __init__(self, codec: str, compress: bool) -> None:
+        if codec not in self._CODECS:
+            raise ValueError(f"unknown codec {codec!r}, use one of {', '.join(self._CODECS)}")
+        self.block, self.chars, self.encoder, self.decoder = self._CODECS[codec]
+        self.compress = compress
+
+    def encode_result(self, result: Any, chunk_size: int) -> Any:
+        if result is None:
+            return None
+        if isinstance(result, str):
+            result = result.encode()
+        if isinstance(result, (bytes, bytearray, memoryview)):
+            if self.compress:
+                result = zlib.compress(result)
+            elif isinstance(result, memoryview) and result.format != "B":
+                result = result.cast("B")
+            return self.encoder(result).decode("ascii")
+        if isinstance(result, Iterator):
+            return self._encode_stream(result, max(self.block, chunk_size - chunk_size % self.block))
+        raise TypeError(f"can't encrypt a {type(result).__name__} result")
+
+    def _encode_stream(self, items: Iterator[Any], chunk_size: int) -> Iterator[str]:
+        pieces = _stream_bytes(items, chunk_size)
+        if self.compress:
+            pieces = _deflated(pieces)
+        # chunk_size is a whole number of blocks, so only the last chunk gets padding
+        for chunk in _rechunk(pieces, chunk_size):
+            yield self.encoder(chunk).decode("ascii")
+
+    def decode_result(self, result: Any, encoding: Optional[str], chunk_size: int) -> Any:
+        if result is None:
+            return None
+        if isinstance(result, (str, bytes, bytearray, memoryview)):
+            data = self.decoder(result)
+            if self.compress:
+                data = zlib.decompress(data)
+            return data.decode(encoding) if encoding else data
+        if isinstance(result, Iterator):
+            return self._decode_stream(result, encoding, max(self.chars, chunk_size - chunk_size % self.chars))
+        raise TypeError(f"can't decrypt a {type(result).__name__} result")
+
+    def _decode_stream(self, items: Iterator[Any], encoding: Optional[str], chunk_size: int) -> Iterator[Any]:
+        pieces = (self.decoder(chunk) for chunk in _rechunk(_stream_bytes(items, chunk_size), chunk_size))
+        if self.compress:
+            pieces = _inflated(pieces, chunk_size)
+        if encoding is None:
+            yield from pieces
+            return
+        text = codecs.getincrementaldecoder(encoding)()
+        for piece in pieces:
+            chunk = text.decode(piece)
+            if chunk:
+                yield chunk
+        chunk = text.decode(b"", True)
+        if chunk:
+            yield chunk
+
+
+def _stream_bytes(items: Iterator[Any], size: int) -> Iterator[bytes | memoryview]:
+    """The items as pieces of about `size` bytes, large items are sliced instead of copied whole."""
+    for item in items:
+        if isinstance(item, str):
+            for start in range(0, len(item), size):
+                yield item[start:start + size].encode()
+        elif isinstance(item, (bytes, bytearray, memoryview)):
+            view = memoryview(item)
+            if view.format != "B" or view.ndim != 1:
+                view = view.cast("B")
+            for start in range(0, len(view), size):
+                yield view[start:start + size]
+        else:
+            raise TypeError(f"can't stream a {type(item).__name__} item, only str and bytes-like ones")
+
+
+def _rechunk(pieces: Iterator[bytes | memoryview], size: int) -> Iterator[bytes | bytearray | memoryview]:
+    """Regroup the pieces into chunks of exactly `size` bytes, the last one may be shorter."""
+    pending = bytearray()
+    for piece in pieces:
+        view = memoryview(piece)
+        start = 0
+        if pending:
+            start = min(size - len(pending), len(view))
+            pending += view[:start]
+            if len(pending) < size:
+                continue
+            yield pending
+            pending = bytearray()
+        while len(view) - start >= size:
+            yield view[start:start + size]
+            start += size
+        pending += view[start:]
+    if pending:
+        yield pending
+
+
+def _deflated(pieces: Iterator[bytes | memoryview]) -> Iterator[bytes]:
+    compressor = zlib.compressobj()
+    for piece in pieces:
+        data = compressor.compress(piece)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _inflated(pieces: Iterator[bytes], size: int) -> Iterator[bytes]:
+    """Decompress the pieces, at most `size` bytes of output at a time."""
+    decompressor = zlib.decompressobj()
+    for piece in pieces:
+        while piece:
+            data = decompressor.decompress(piece, size)
+            piece = decompressor.unconsumed_tail
+            if data:
+                yield data
+    data = decompressor.flush()
+    if data:
+        yield data
+
+
+
+def retry(attempts: int = 3, backoff: str | Callable[[int], float] = "exponential", jitter: bool = True,
+          on: type[BaseException] | tuple[type[BaseException], ...] = (Exception,), delay: float = 0.1,
+          max_delay: float = 30.0) -> Any:
+    """Calls the function (or coroutine function) again when it raises, waiting longer each time.
+
+    arguments:
+    attempts -- calls made at most, the last error is raised when all of them fail
+    backoff -- "exponential" (delay, 2·delay, 4·delay, ...), "linear", "constant",
+               or a function of the retry number (0, 1, ...) giving the seconds to wait
+    jitter -- wait a random time between 0 and the backoff instead (full jitter)
+    on -- the exceptions worth retrying, others are raised at once
+    delay, max_delay -- the first wait and the longest wait, in seconds
+
+    The wrapper's retry_stats() gives the calls, attempts, retries and failures.
+
+    >>>
+    	@retry(5, on=(ConnectionError, TimeoutError))
+    	def fetch(url):
+    		return requests.get(url)
+    """
+    if attempts < 1:
+        raise ValueError("retry needs at least one attempt")
+    if callable(backoff):
+        schedule = backoff
+    elif backoff in _BACKOFFS:
+        schedule = lambda n: _BACKOFFS[backoff](delay, n)
+    else:
+        raise ValueError(f"unknown backoff {backoff!r}, use {', '.join(_BACKOFFS)} or a function")
+
+    def wait_time(n: int) -> float:
+        wait = min(max_delay, schedule(n))
+        return random.uniform(0, wait) if jitter else wait
+
+    def decorator(func):
+        stats = {"calls": 0, "attempts": 0, "retries": 0, "failures": 0}
+        lock = threading.Lock()
+
+        def count(field: str) -> None:
+            with lock:
+                stats[field] += 1
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                count("calls")
+                for n in range(attempts):
+                    count("attempts")
+                    try:
+                        return await func(*args, **kwargs)
+                    except on:
+                        if n + 1 == attempts:
+                            count("failures")
+                            raise
+                    except BaseException:
+                        count("failures")
+                        raise
+                    count("retries")
+                    await asyncio.sleep(wait_time(n))
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                count("calls")
+                for n in range(attempts):
+                    count("attempts")
+                    try:
+                        return func(*args, **kwargs)
+                    except on:
+                        if n + 1 == attempts:
+                            count("failures")
+                            raise
+                    except BaseException:
+                        count("failures")
+                        raise
+                    count("retries")
+                    time.sleep(wait_time(n))
+
+        wrapper.retry_stats = lambda: dict(stats)
+        return wrapper
+    return decorator
+
+
+_BACKOFFS = {
+    "exponential": lambda delay, n: delay * 2 ** n,
+    "linear": lambda delay, n: delay * (n + 1),
+    "constant": lambda delay, n: delay,
+}
+
+
+
+def timeout(seconds: float) -> Any:
+    """Raises TimeoutError when the function (or coroutine function) takes longer than the given seconds.
+
+    Coroutines are cancelled with asyncio.wait_for. Sync functions run on a daemon thread the caller
+    stops waiting for; Python can't stop a thread, so a timed out call keeps running in the background.
+
+    The wrapper's timeout_stats() gives the calls and timeouts.
+
+    >>>
+    	@timeout(2)
+    	def lookup(word):
+    		return auto_correct(word, dictionary)
+    """
+    def decorator(func):
+        stats = {"calls": 0, "timeouts": 0}
+        lock = threading.Lock()
+        message = f"Function '{func.__name__}' timed out after {seconds} seconds."
+
+        def count(field: str) -> None:
+            with lock:
+                stats[field] += 1
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                count("calls")
+                # asyncio.wait instead of wait_for: a TimeoutError raised by the function
+                # itself must not pass for the deadline expiring
+                task = asyncio.ensure_future(func(*args, **kwargs))
+                try:
+                    done, _ = await asyncio.wait((task,), timeout=seconds)
+                except asyncio.CancelledError:
+                    task.cancel()
+                    raise
+                if not done:
+                    task.cancel()
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await task
+                    count("timeouts")
+                    raise TimeoutError(message)
+                return task.result()
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                count("calls")
+                future: Future = Future()
+                future.set_running_or_notify_cancel()
+                threading.Thread(target=_settle, args=(future, func, args, kwargs),
+                                 name=f"timeout-{func.__name__}", daemon=True).start()
+                # wait, then read the result: a TimeoutError raised by the function itself
+                # must not pass for the deadline expiring
+                if not wait_futures((future,), seconds).done:
+                    count("timeouts")
+                    raise TimeoutError(message)
+                return future.result()
+
+        wrapper.timeout_stats = lambda: dict(stats)
+        return wrapper
+    return decorator
+
+
+
+class RateLimited(Exception):
+    """Raised by a rate limited function called in non-blocking mode when no call is available."""
+
+
+
+def rate_limited(calls: int, period: float = 1.0, *, burst: Optional[int] = None, block: bool = True) -> Any:
+    """Limits the function (or coroutine function) to a number of calls per period, with a token bucket.
+
+    arguments:
+    calls, period -- calls allowed per period of seconds, on average
+    burst -- calls allowed back to back after a quiet time (default: calls)
+    block -- wait for the next available call (asyncio.sleep for coroutine functions), or raise
+             RateLimited at once when there is none
+
+    The wrapper's limiter_stats() gives the calls, rejected calls and seconds waited (total and max).
+
+    >>>
+    	@rate_limited(10, 1.0)
+    	def fetch(url):
+    		return requests.get(url)
+
+    	[fetch(url) for url in urls] → at most 10 requests per second
+    """
+    bucket = _TokenBucket(calls / period, burst or calls)
+
+    def decorator(func):
+        name = func.__name__
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                wait = bucket.reserve(block)
+                if wait is None:
+                    raise RateLimited(f"Function '{name}' is rate limited.")
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                return await func(*args, **kwargs)
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                wait = bucket.reserve(block)
+                if wait is None:
+                    raise RateLimited(f"Function '{name}' is rate limited.")
+                if wait > 0:
+                    time.sleep(wait)
+                return func(*args, **kwargs)
+
+        wrapper.limiter_stats = bucket.stats
+        return wrapper
+    return decorator
+
+
+def throttle(seconds: float) -> Any:
+    """Runs the function (or coroutine function) at most once every given seconds.
+    Calls in between don't run it and return the result of the last call that did.
+
+    >>>
+    	@throttle(1)
+    	def refresh():
+    		return load_dashboard()
+
+    	refresh(); refresh() → runs once, the second call returns the first result
+    """
+    def decorator(func):
+        bucket = _TokenBucket(1 / seconds, 1)
+        last = None
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                nonlocal last
+                if bucket.reserve(False) is None:
+                    return last
+                last = await func(*args, **kwargs)
+                return last
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                nonlocal last
+                if bucket.reserve(False) is None:
+                    return last
+                last = func(*args, **kwargs)
+                return last
+
+        wrapper.limiter_stats = bucket.stats
+        return wrapper
+    return decorator
+
+
+def debounce(seconds: float) -> Any:
+    """Runs the function (or coroutine function) once calls have stopped for the given seconds,
+    with the arguments of the last call.
+
+    Calls return a concurrent.futures.Future (an awaitable for coroutine functions) of that run's
+    result, shared by every call it absorbed. The timer runs on the scheduler thread of delayed.
+
+    >>>
+    	@debounce(0.5)
+    	def save(text):
+    		write(text)
+
+    	save("a"); save("ab"); save("abc") → one write of "abc", half a second later
+    """
+    def decorator(func):
+        lock = threading.Lock()
+        stats = {"calls": 0, "runs": 0}
+        if inspect.iscoroutinefunction(func):
+            state: dict[str, Any] = {"handle": None, "future": None}
+
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                loop = asyncio.get_running_loop()
+                stats["calls"] += 1
+                if state["handle"] is not None:
+                    state["handle"].cancel()
+                if state["future"] is None:
+                    state["future"] = loop.create_future()
+                future = state["future"]
+
+                def fire():
+                    # detach the future, calls arriving while this run awaits start a new one
+                    state["handle"] = state["future"] = None
+                    stats["runs"] += 1
+                    task = loop.create_task(func(*args, **kwargs))
+                    task.add_done_callback(lambda task: _chain(task, future))
+
+                state["handle"] = loop.call_later(seconds, fire)
+                return await asyncio.shield(future)
+        else:
+            state = {"timer": None, "future": None, "generation": 0}
+
+            def fire(generation, args, kwargs):
+                with lock:
+                    if generation != state["generation"]:
+                        return  # a later call took over
+                    future, state["future"], state["timer"] = state["future"], None, None
+                    stats["runs"] += 1
+                _settle(future, func, args, kwargs)
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with lock:
+                    stats["calls"] += 1
+                    state["generation"] += 1
+                    if state["timer"] is not None:
+                        state["timer"].cancel()
+                    future = state["future"] = state["future"] or Future()
+                    state["timer"] = _scheduler().schedule(seconds, fire, (state["generation"], args, kwargs), {})
+                return future
+
+        wrapper.limiter_stats = lambda: dict(stats)
+        return wrapper
+    return decorator
+
+
+def _chain(task: "asyncio.Future", future: "asyncio.Future") -> None:
+    if future.done():
+        return
+    if task.cancelled():
+        future.cancel()
+    elif task.exception() is not None:
+        future.set_exception(task.exception())
+    else:
+        future.set_result(task.result())
+
+
+class _TokenBucket:
+    """Tokens refilled at rate per second up to capacity, handed out by reservation.
+
+    A blocking caller takes its token right away (the balance can go below zero) and is told
+    how long to wait, so it sleeps outside the lock and waiters are served in order.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.calls = self.rejected = 0
+        self.waited = self.max_wait = 0.0
+
+    def reserve(self, block: bool) -> Optional[float]:
+        """Seconds to wait before calling, None when not blocking and no token is available."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1 and not block:
+                self.rejected += 1
+                return None
+            self.tokens -= 1
+            self.calls += 1
+            wait = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+            self.waited += wait
+            if wait > self.max_wait:
+                self.max_wait = wait
+            return wait
+
+    def stats(self) -> dict[str, float]:
+        with self.lock:
+            return {"calls": self.calls, "rejected": self.rejected, "waited": self.waited, "max_wait": self.max_wait}
+
+
+
+# waits: calls that joined a computation already in flight instead of running their own
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize", "waits"], defaults=(0,))
+
+
+def cached(func: Optional[Callable] = None, *, maxsize: Optional[int] = 128, ttl: Optional[float] = None,
+           typed: bool = False, key: Optional[Callable[..., Any]] = None) -> Any:
+    """A decorator memoizing the results of a function (or coroutine function).
+
+    arguments:
+    maxsize -- number of results kept, the least recently used is evicted first (None for no limit)
+    ttl -- seconds a result stays valid (None for forever)
+    typed -- cache arguments of different types separately, e.g. 1 and 1.0
+    key -- function building the cache key from the call's arguments, for arguments the default key can't handle
+
+    Concurrent calls with the same key wait for the first one instead of computing again,
+    cache_info() counts them as waits rather than misses.
+    The wrapper has cache_info() and cache_clear() like functools.lru_cache.
+
+    >>>
+    	@cached(maxsize=1024, ttl=60)
+    	def lookup(word):
+    		return auto_correct(word, dictionary)
+
+    	lookup("helo") → 'hello'
+    	lookup.cache_info() → CacheInfo(hits=0, misses=1, evictions=0, maxsize=1024, currsize=1, waits=0)
+    """
+    if func is None:
+        return lambda func: cached(func, maxsize=maxsize, ttl=ttl, typed=typed, key=key)
+
+    make_key = key or (lambda *args, **kwargs: _make_key(args, kwargs, typed))
+    cache = _Cache(maxsize, ttl)
+
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            k = make_key(*args, **kwargs)
+            # the lookup and the in-flight check share one lock, so a caller can't
+            # miss just before the owner stores its result and compute again
+            with cache.lock:
+                found, value = cache.lookup(k)
+                if found:
+                    return value
+                task = cache.inflight.get(k)
+                if task is None or task.get_loop() is not asyncio.get_running_loop():
+                    cache.misses += 1
+                    task = asyncio.ensure_future(func(*args, **kwargs))
+                    task.add_done_callback(lambda task: cache.settle_task(k, task))
+                    cache.inflight[k] = task
+                else:
+                    cache.waits += 1
+            # shielded so a cancelled caller doesn't cancel the computation the others wait for
+            return await asyncio.shield(task)
+    else:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            k = make_key(*args, **kwargs)
+            with cache.lock:
+                found, value = cache.lookup(k)
+                if found:
+                    return value
+                call = cache.inflight.get(k)
+                owner = call is None
+                if owner:
+                    cache.misses += 1
+                    call = cache.inflight[k] = _Call()
+                else:
+                    cache.waits += 1
+            if not owner:
+                return call.wait()
+            try:
+                call.result = func(*args, **kwargs)
+            except BaseException as error:
+                call.error = error
+                raise
+            finally:
+                cache.settle(k, call)
+            return call.result
+
+    wrapper.cache_info = cache.info
+    wrapper.cache_clear = cache.clear
+    return wrapper
+
+
+def disk_cached(path: str | os.PathLike, max_bytes: Optional[int] = None) -> Any:
+    """A decorator memoizing the results of a function in a SQLite file, across processes and restarts.
+
+    arguments:
+    path -- the cache file, shared by every function and process using it
+    max_bytes -- size of the stored results above which the least recently used are evicted (None for no limit)
+
+    Results are keyed by a hash of the function's qualified name, its source and the call's arguments,
+    so editing the function invalidates its old results. Arguments and results must be picklable.
+
+    >>>
+    	@disk_cached("cache.sqlite", max_bytes=1 << 30)
+    	def embed(text):
+    		...
+
+    	embed("hello") → computed once, then read from cache.sqlite even after a restart
+    """
+    store = _DiskStore(os.fspath(path), max_bytes)
+
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+        try:
+            source = inspect.getsource(func).encode()
+        except (OSError, TypeError):
+            source = func.__code__.co_code
+        version = hashlib.sha256(source).hexdigest()
+        purged = False
+
+        def lookup(args, kwargs):
+            nonlocal purged
+            if not purged:
+                store.purge(name, version)
+                purged = True
+            arguments = _argument_bytes(args, kwargs)
+            if arguments is None:
+                return None, None  # unpicklable arguments bypass the cache
+            key = hashlib.sha256(name.encode() + version.encode() + arguments).hexdigest()
+            return key, store.get(key)
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                key, found = lookup(args, kwargs)
+                if found is not None:
+                    return pickle.loads(found)
+                result = await func(*args, **kwargs)
+                if key is not None:
+                    store.put(key, name, version, pickle.dumps(result, pickle.HIGHEST_PROTOCOL))
+                return result
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                key, found = lookup(args, kwargs)
+                if found is not None:
+                    return pickle.loads(found)
+                result = func(*args, **kwargs)
+                if key is not None:
+                    store.put(key, name, version, pickle.dumps(result, pickle.HIGHEST_PROTOCOL))
+                return result
+
+        wrapper.cache_info = lambda: store.info(name)
+        wrapper.cache_clear = lambda: store.clear(name)
+        return wrapper
+    return decorator
+
+
+def _argument_bytes(args: tuple, kwargs: dict) -> Optional[bytes]:
+    """A stable encoding of the call's arguments, None when they can't be pickled."""
+    try:
+        return pickle.dumps(_canonical((args, sorted(kwargs.items()))), 4)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None
+
+
+class _Canonical(tuple):
+    """A set or dict argument with its items sorted, so it pickles the same in every process."""
+
+    __slots__ = ()
+
+
+def _canonical(value: Any) -> Any:
+    # sets and dicts pickle in hash-seed (or insertion) order, sort their items by their own pickle
+    if isinstance(value, (set, frozenset)):
+        items = sorted(pickle.dumps(_canonical(item), 4) for item in value)
+        return _Canonical((type(value).__name__,) + tuple(items))
+    if isinstance(value, dict):
+        items = sorted((pickle.dumps(_canonical(k), 4), _canonical(v)) for k, v in value.items())
+        return _Canonical((type(value).__name__,) + tuple(items))
+    if type(value) in (list, tuple):
+        return type(value)(_canonical(item) for item in value)
+    return value
+
+
+class _DiskStore:
+    """The SQLite table behind disk_cached, with one connection per thread and process."""
+
+    def __init__(self, path: str, max_bytes: Optional[int]) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.local = threading.local()
+        self.counts: dict[str, list[int]] = {}
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        db = getattr(self.local, "db", None)
+        if db is None or self.local.pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # autocommit, each statement is its own transaction
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            with _transaction(db):
+                db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, func TEXT, version TEXT, "
+                           "value BLOB, size INTEGER, used REAL)")
+                db.execute("CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+                db.execute("CREATE INDEX IF NOT EXISTS results_func ON results (func)")
+                # the total size is kept up to date by triggers, so a put doesn't have to sum the table
+                db.execute("CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER)")
+                db.execute("INSERT OR IGNORE INTO totals SELECT 0, COALESCE(SUM(size), 0) FROM results")
+                db.execute("CREATE TRIGGER IF NOT EXISTS results_added AFTER INSERT ON results "
+                           "BEGIN UPDATE totals SET bytes = bytes + new.size WHERE id = 0; END")
+                db.execute("CREATE TRIGGER IF NOT EXISTS results_removed AFTER DELETE ON results "
+                           "BEGIN UPDATE totals SET bytes = bytes - old.size WHERE id = 0; END")
+            self.local.db, self.local.pid = db, os.getpid()
+        return db
+
+    def count(self, name: str, field: int) -> None:
+        self.counts.setdefault(name, [0, 0, 0])[field] += 1
+
+    def purge(self, name: str, version: str) -> None:
+        self.db.execute("DELETE FROM results WHERE func = ? AND version != ?", (name, version))
+
+    def get(self, key: str) -> Optional[bytes]:
+        db = self.db
+        row = db.execute("SELECT func, value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        db.execute("UPDATE results SET used = ? WHERE key = ?", (time.time(), key))
+        self.count(row[0], 0)
+        return row[1]
+
+    def put(self, key: str, name: str, version: str, value: bytes) -> None:
+        self.count(name, 1)
+        db = self.db
+        with _transaction(db):
+            # delete then insert rather than INSERT OR REPLACE, whose implicit delete skips the triggers
+            db.execute("DELETE FROM results WHERE key = ?", (key,))
+            db.execute("INSERT INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                       (key, name, version, value, len(value), time.time()))
+            if self.max_bytes is None:
+                return
+            excess = db.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()[0] - self.max_bytes
+            evicted = 0
+            while excess > 0:
+                keys = []
+                for old_key, size in db.execute("SELECT key, size FROM results ORDER BY used, key LIMIT 64"):
+                    keys.append((old_key,))
+                    excess -= size
+                    if excess <= 0:
+                        break
+                if not keys:
+                    break
+                db.executemany("DELETE FROM results WHERE key = ?", keys)
+                evicted += len(keys)
+        if evicted:
+            self.counts[name][2] += evicted
+
+    def info(self, name: str) -> CacheInfo:
+        hits, misses, evictions = self.counts.get(name, (0, 0, 0))
+        size = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM results WHERE func = ?", (name,)).fetchone()[0]
+        return CacheInfo(hits, misses, evictions, self.max_bytes, size)
+
+    def clear(self, name: str) -> None:
+        self.db.execute("DELETE FROM results WHERE func = ?", (name,))
+        self.counts.pop(name, None)
+
+
+@contextlib.contextmanager
+def _transaction(db: sqlite3.Connection) -> Iterator[None]:
+    """BEGIN IMMEDIATE ... COMMIT on an autocommit connection, rolled back on errors."""
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        db.execute("ROLLBACK")
+        raise
+    db.execute("COMMIT")
+
+
+class _Call:
+    """One in-flight computation of a cached sync function."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self) -> Any:
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class _Cache:
+    """LRU + TTL store behind cached, with the in-flight calls and the counters."""
+
+    def __init__(self, maxsize: Optional[int], ttl: Optional[float]) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.data: OrderedDict = OrderedDict()
+        self.inflight: dict = {}
+        self.hits = self.misses = self.evictions = self.waits = 0
+
+    def lookup(self, key: Any) -> tuple[bool, Any]:
+        """Find a live result and count the hit, the caller holds self.lock and counts a miss or a wait."""
+        entry = self.data.get(key)
+        if entry is not None:
+            value, expires = entry
+            if expires is None or expires > time.monotonic():
+                self.data.move_to_end(key)
+                self.hits += 1
+                return True, value
+            del self.data[key]
+            self.evictions += 1
+        return False, None
+
+    def put(self, key: Any, value: Any) -> None:
+        if self.maxsize is not None and self.maxsize <= 0:
+            return
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        self.data[key] = (value, expires)
+        self.data.move_to_end(key)
+        if self.maxsize is not None and len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+            self.evictions += 1
+
+    def settle(self, key: Any, call: _Call) -> None:
+        with self.lock:
+            if call.error is None:
+                self.put(key, call.result)
+            if self.inflight.get(key) is call:
+                del self.inflight[key]
+        call.done.set()
+
+    def settle_task(self, key: Any, task: "asyncio.Future") -> None:
+        with self.lock:
+            if not task.cancelled() and task.exception() is None:
+                self.put(key, task.result())
+            if self.inflight.get(key) is task:
+                del self.inflight[key]
+
+    def info(self) -> CacheInfo:
+        with self.lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self.data), self.waits)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.data.clear()
+            self.hits = self.misses = self.evictions = self.waits = 0
+
+
+_KWD_MARK = object()
+
+
+def _make_key(args: tuple, kwargs: dict, typed: bool) -> Any:
+    key = args
+    if kwargs:
+        key += (_KWD_MARK,) + tuple(sorted(kwargs.items()))
+    if typed:
+        key += tuple(type(arg) for arg in args) + tuple(type(value) for _, value in sorted(kwargs.items()))
+    try:
+        hash(key)
+    except TypeError:
+        key = _freeze(key)
+    return key
+
+
+class _Frozen(tuple):
+    """A frozen list, dict, set or bytearray argument, never equal to a plain tuple."""
+
+    __slots__ = ()
+
+    def __eq__(self, other: Any) -> bool:
+        return type(other) is _Frozen and tuple.__eq__(self, other)
+
+    def __ne__(self, other: Any) -> bool:
+        return not self == other
+
+    def __hash__(self) -> int:
+        return hash((_Frozen, tuple(self)))
+
+
+def _freeze(value: Any) -> Any:
+    """A hashable stand-in for lists, dicts and sets among the arguments."""
+    if isinstance(value, (list, tuple)):
+        return _Frozen((type(value).__name__,) + tuple(_freeze(item) for item in value))
+    if isinstance(value, dict):
+        return _Frozen(("dict", frozenset((k, _freeze(v)) for k, v in value.items())))
+    if isinstance(value, (set, frozenset)):
+        return _Frozen(("set", frozenset(_freeze(item) for item in value)))
+    if isinstance(value, (bytearray, memoryview)):
+        return _Frozen(("bytes", bytes(value)))
+    hash(value)  # let a truly unhashable argument raise its TypeError
+    return value